@@ -1,35 +1,43 @@
 import asyncio
 import logging
 
-from conans.client.conan_api import Conan
-from conans.util.conan_v2_mode import CONAN_V2_MODE_ENVVAR
-
-from jinja2 import Environment, PackageLoader
-
 import os
 
 logging.basicConfig(level=logging.DEBUG if 'CPPPM_DEBUG' in os.environ else logging.INFO)
 
 _logger = logging.getLogger('cpppm')
 
-_jenv = Environment(loader=PackageLoader('cpppm', 'templates'), extensions=['jinja2.ext.do'])
-
 _config_option = {"--config", "-C"}
 
 _source_path = None
 __build_path = None
 
-os.environ[CONAN_V2_MODE_ENVVAR] = "1"
+# conans.util.conan_v2_mode.CONAN_V2_MODE_ENVVAR (conan is only imported when needed, see get_conan)
+os.environ["CONAN_V2_MODE"] = "1"
 
-__conan = Conan()
+__conan = None
+__jenv = None
 
 
 def get_conan():
+    global __conan
+    if __conan is None:
+        from conans.client.conan_api import Conan
+        __conan = Conan()
     if __conan.app is None:
         __conan.create_app()
     return __conan
 
 
+def get_jenv():
+    """Get the templates environment (jinja2 is only imported when needed)"""
+    global __jenv
+    if __jenv is None:
+        from jinja2 import Environment, PackageLoader
+        __jenv = Environment(loader=PackageLoader('cpppm', 'templates'), extensions=['jinja2.ext.do'])
+    return __jenv
+
+
 def _get_logger(obj, ident):
     return _logger.getChild(f'{obj.__class__.__name__}({ident})')
 
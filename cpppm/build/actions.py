@@ -0,0 +1,49 @@
+import asyncio
+from pathlib import Path
+from typing import Callable, List, Union
+
+
+class Action:
+    """A planned build step
+
+    :param kind: Action kind ('generator', 'pch', 'compile', 'archive' or 'link').
+    :param target: Target the action belongs to.
+    :param output: Produced file.
+    :param reason: Why the action has to be run.
+    :param func: The coroutine function (or function) running the action.
+    :param database: Dependency database updated by the action (saved by the executor).
+    :param memory: Expected peak memory of the action process in bytes (0: unknown).
+    :param duration: Expected wall time of the action in seconds (None: unknown).
+    :param statistics: Build statistics updated by the action (saved by the executor).
+
+    `depends`, `dependents` and `priority` are set by the build graph.
+    """
+
+    def __init__(self, kind: str, target: 'cpppm.Target', output: Union[Path, str], reason: str,
+                 func: Callable, database: 'cpppm.build.depdb.DependencyDatabase' = None, memory: int = 0,
+                 duration: float = None, statistics: 'cpppm.build.stats.BuildStatistics' = None):
+        self.kind = kind
+        self.target = target
+        self.output = output
+        self.reason = reason
+        self.func = func
+        self.database = database
+        self.memory = memory
+        self.duration = duration
+        self.statistics = statistics
+        self.depends: List['Action'] = list()
+        self.dependents: List['Action'] = list()
+        self.priority = 0.0
+
+    @property
+    def name(self):
+        return self.output.name if isinstance(self.output, Path) else str(self.output)
+
+    async def run(self):
+        result = self.func()
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    def __str__(self):
+        return f'{self.kind} {self.name} ({self.target}): {self.reason}'
@@ -0,0 +1,19 @@
+import json
+from pathlib import Path
+from typing import Iterable
+
+from cpppm.utils.files import write_if_changed
+
+
+def export_compile_commands(output: Path, targets: Iterable['cpppm.Target'], compiler) -> bool:
+    """Write the compilation database of targets to output
+
+    Entries derive from the targets compile templates (memoized until target properties change),
+    output is only rewritten when its content changed (so that tools watching it are not needlessly reloaded).
+
+    :return: True if output has been updated.
+    """
+    entries = list()
+    for target in sorted(targets, key=lambda t: t.name):
+        entries.extend(compiler.compile_commands(target))
+    return write_if_changed(output, json.dumps(entries, indent=2))
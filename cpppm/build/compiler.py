@@ -1,15 +1,24 @@
 import asyncio
-import hashlib
 import re
 import shutil
 from abc import abstractmethod
 
 import platform
+from pathlib import Path
+from typing import Tuple, Union
 
 from cpppm import _get_logger
+from cpppm.build.actions import Action
+from cpppm.build.depdb import DependencyDatabase
+from cpppm.build.stats import BuildStatistics
+from cpppm.build.unity import unity_sources
+from cpppm.cache.objects import get_object_cache
 from cpppm.config import config
+from cpppm.utils.decorators import collect_version
+from cpppm.utils.files import stat_cache, write_if_changed
+from cpppm.utils.jobs import job_pool
 from cpppm.utils.pathlist import PathList
-from cpppm.utils.runner import Runner, ProcessError
+from cpppm.utils.runner import Runner, ProcessError, ProcessResult
 
 
 class CompileError(ProcessError):
@@ -17,10 +26,16 @@ class CompileError(ProcessError):
 
 
 class Compiler:
+    """Toolchain compiler session
+
+    A single instance is used per toolchain (see Toolchain.cxx_compiler), owning the tools runners,
+    the job pool they share, the recorded commands and the build statistics.
+    """
     force = False
-    _include_pattern = re.compile(r'#include [<"](.+)[>"]')
+    # only planning: generated build files (unity batches, precompiled headers) are not written
+    dry_run = False
 
-    def __init__(self, toolchain, *args, **kwargs):
+    def __init__(self, toolchain, *args, pool=job_pool, **kwargs):
 
         assert hasattr(self, 'object_extension')
         assert hasattr(self, 'static_extension')
@@ -30,10 +45,16 @@ class Compiler:
         assert hasattr(self, 'lib_flag')
         assert hasattr(self, 'define_flag')
 
-        self.commands = list()
+        self._templates = dict()
+        self._databases = dict()
+        self._statistics = None
+        self._test_statistics = None
         ccache = shutil.which('ccache') if config.ccache else None
         self.toolchain = toolchain
+        self.pool = pool
+        kwargs['pool'] = pool
         self._logger = _get_logger(self, toolchain.id)
+        self.reset_stats()
         if ccache:
             self.cc_runner = Runner(ccache, args={str(toolchain.cc), *args}, recorder=self.on_cmd, **kwargs)
             self.cxx_runner = Runner(ccache, args={str(toolchain.cxx), *args}, recorder=self.on_cmd, **kwargs)
@@ -49,40 +70,52 @@ class Compiler:
     def on_cmd(self, cmd):
         self.commands.append(cmd)
 
+    def reset_stats(self):
+        self.commands = list()
+        self.compiled = 0
+        self.fetched = 0
+        self.linked = 0
+        self.pool.reset_stats()
+
+    @property
+    def statistics(self) -> BuildStatistics:
+        """Compilation statistics history of current build directory"""
+        if self._statistics is None or self._statistics.path.parent != config._build_path:
+            self._statistics = BuildStatistics(config._build_path / 'cpppm-stats.json')
+        return self._statistics
+
+    @property
+    def test_statistics(self) -> BuildStatistics:
+        """Test executables durations history of current build directory"""
+        if self._test_statistics is None or self._test_statistics.path.parent != config._build_path:
+            self._test_statistics = BuildStatistics(config._build_path / 'cpppm-test-stats.json')
+        return self._test_statistics
+
+    def memory_estimate(self, target, output) -> int:
+        """Expected compiler peak memory (bytes) for output: last recorded one, else target estimate (0: unknown)"""
+        rss = self.statistics.last(output, 'rss')
+        if rss is not None:
+            return rss
+        return (target.memory_estimate or 0) << 20
+
+    def report(self):
+        self.pool.report()
+        self._logger.info(f'{self.compiled} object(s) compiled, {self.fetched} fetched from cache, '
+                          f'{self.linked} binary(ies) linked')
+
     def is_clang(self):
         return self.toolchain.name in {'clang', 'apple-clang'}
 
     def is_msvc(self):
         return self.toolchain.name in {'msvc'}
 
-    def source_deps(self, target, source):
-        deps = set()
-        for line in open(source.absolute(), 'r'):
-            for m in re.finditer(Compiler._include_pattern, line):
-                include = m.group(1)
-                for p in target.include_dirs.absolute():
-                    fullpath = (p / include)
-                    if fullpath.exists():
-                        deps.add(fullpath)
-        return deps
-
-    def _is_source_outdated(self, target, source, deps):
-        for dep in deps:
-            sha = hashlib.sha1(str(dep).encode())
-            sha.update(str(source.absolute()).encode())
-            timestamp = target.build_path / 'deps' / (sha.hexdigest() + '.ts')
-            if not timestamp.exists() or timestamp.stat().st_mtime < dep.stat().st_mtime:
-                self._logger.debug(f"outdated: {source} (changed: {dep})")
-                return True
-        return False
-
-    def _update_deps_timestamps(self, target, source, deps):
-        for dep in deps:
-            sha = hashlib.sha1(str(dep).encode())
-            sha.update(str(source.absolute()).encode())
-            timestamp = target.build_path / 'deps' / (sha.hexdigest() + '.ts')
-            timestamp.parent.mkdir(exist_ok=True, parents=True)
-            timestamp.touch(exist_ok=True)
+    def dependency_database(self, target) -> DependencyDatabase:
+        """Get target dependency database (loaded once per session)"""
+        path = target.build_path / 'deps' / f'{target.name}.json'
+        database = self._databases.get(path)
+        if database is None:
+            database = self._databases[path] = DependencyDatabase(path)
+        return database
 
     @abstractmethod
     def make_include_dirs_option(self, include_dirs: PathList):
@@ -97,7 +130,74 @@ class Compiler:
         pass
 
     @abstractmethod
+    def object_flags(self, flags=None, pic=False) -> Tuple[str, ...]:
+        """Get compile arguments, but the source and output ones (without the compiler executable)"""
+        pass
+
+    @abstractmethod
+    def object_files(self, source, output_path) -> Tuple[str, ...]:
+        """Get source and output compile arguments"""
+        pass
+
+    @abstractmethod
+    async def run_object_command(self, command, test=False):
+        """Run the compiler with given arguments (as built by object_command)"""
+        pass
+
+    @abstractmethod
+    def pch_path(self, header: Path) -> Path:
+        """Get the precompiled header file of given header"""
+        pass
+
+    @abstractmethod
+    def pch_command(self, header: Path, pch: Path, flags) -> list:
+        """Get the header precompilation arguments
+
+        :param flags: Target compile template (without precompiled header usage).
+        """
+        pass
+
+    @abstractmethod
+    def pch_use_flags(self, header: Path, pch: Path) -> Tuple[str, ...]:
+        """Get the arguments using the precompiled header in a compilation"""
+        pass
+
+    def pch_object(self, header: Path) -> Union[Path, None]:
+        """Get the object produced along with the precompiled header (to be linked), if any"""
+        return None
+
+    def pch_header(self, target) -> Union[Path, None]:
+        """Get the header including all target precompiled headers (generated in target build directory)
+
+        :return: None if target has no precompiled headers.
+        """
+        if not target.precompiled_headers:
+            return None
+        lines = list()
+        for header in target.precompiled_headers:
+            header = str(header)
+            if header.startswith('<'):
+                lines.append(f'#include {header}\n')
+            else:
+                lines.append(f'#include "{(target.source_path / header).absolute().as_posix()}"\n')
+        header = target.build_path.absolute() / 'pch' / f'{target.name}.hpp'
+        if not Compiler.dry_run:
+            write_if_changed(header, ''.join(lines))
+        return header
+
+    def object_command(self, source, output_path, flags=None, pic=False):
+        """Get compile_object arguments (without the compiler executable)"""
+        return [*self.object_flags(flags, pic=pic), *self.object_files(source, output_path)]
+
     async def compile_object(self, source, output_path, flags=None, pic=False, test=False):
+        return await self.run_object_command(self.object_command(source, output_path, flags, pic=pic), test=test)
+
+    @abstractmethod
+    def object_deps(self, source, obj, result):
+        """Get the headers used by the last compilation of obj
+
+        :param result: compile_object result.
+        """
         pass
 
     @abstractmethod
@@ -112,12 +212,8 @@ class Compiler:
     async def link_executable(self, output, objs, flags=None, pic=False):
         pass
 
-    async def compile(self, target: 'cpppm.target.Target', pic=True,
-                      force=False):
+    def target_compile_options(self, target):
         from cpppm import Library
-        force = force or Compiler.force
-        self._logger.info(f'building {target}')
-        output = target.build_path.absolute()
         opts = list()
         opts.extend(self.make_include_dirs_option(target.include_dirs))
         # opts.extend(self.make_compile_options(target.compile_definitions))
@@ -127,66 +223,216 @@ class Compiler:
                 target.shared:
             opts.append(f'/D{target.macro_name}_DLL_EXPORT=1')
 
-        for k, v in target.compile_definitions.items():
+        # collected from sets: sorted so that the command (hence its signature) is stable across runs
+        for k, v in sorted(target.compile_definitions.items()):
             if v is not None:
                 opts.append(f'{self.define_flag}{k}={v}')
             else:
                 opts.append(f'{self.define_flag}{k}')
 
-        opts.extend(target.compile_options)
+        opts.extend(sorted(target.compile_options))
+        return opts
+
+    def compile_template(self, target, pic=True, pch=True) -> Tuple[str, ...]:
+        """Get target compile arguments, but the source and output ones
+
+        Computed once and reused for all target sources (until target properties or toolchain flags change).
+
+        :param pch: Use target precompiled headers (if any).
+        """
+        key = (collect_version(), tuple(self.toolchain.cxx_flags))
+        cached = self._templates.get((target, pic, pch))
+        if cached is None or cached[0] != key:
+            flags = tuple(self.object_flags(self.target_compile_options(target), pic=pic))
+            header = self.pch_header(target) if pch else None
+            if header is not None:
+                flags = (*flags, *self.pch_use_flags(header, self.pch_path(header)))
+            cached = key, flags
+            self._templates[(target, pic, pch)] = cached
+        return cached[1]
+
+    def target_link_options(self, target) -> Tuple[str, ...]:
+        from cpppm import Library
+        opts = [*self.toolchain.link_flags]
+        opts.extend(self.make_link_dirs_option(target.library_dirs))
+        lib_names = []
+        for lib in target.lib_dependencies:
+            if isinstance(lib, str):
+                lib_names.append(lib)
+            elif not lib.is_header_only:
+                lib_names.append(lib.name)
+        opts.extend(self.make_link_option(lib_names))
+        if self.is_clang() and not isinstance(target, Library):
+            opts.append(f'-stdlib={config.toolchain.libcxx}')
+        return tuple(opts)
+
+    def compile_commands(self, target, pic=True):
+        """Get target compilation database entries"""
+        output = target.build_path.absolute()
+        template = self.compile_template(target, pic=pic)
+        return [{
+            'directory': str(output),
+            'file': str(source),
+            'output': str(output / source.with_suffix(self.object_extension).name),
+            'arguments': [str(self.toolchain.cxx), *template, *self.object_files(source, output)],
+        } for source in target.compile_sources.absolute()]
+
+    def plan(self, target: 'cpppm.target.Target', pic=True, force=False, rebuilt=(), generated=False):
+        """Compute target compile and link actions
+
+        :param rebuilt: Targets that are planned to be rebuilt (forcing dependent targets relink).
+        :param generated: Target inputs are generated during the build (up-to-date objects are re-checked when run).
+        :return: List of actions (compilations first, then link if needed).
+        """
+        from cpppm import Library
+        force = force or Compiler.force
+        output = target.build_path.absolute()
+        template = self.compile_template(target, pic=pic)
         objs = set()
-        compilations = set()
-        for source in target.compile_sources.absolute():
+        actions = list()
+        deps_db = self.dependency_database(target)
+        object_cache = get_object_cache()
+        sources = unity_sources(target, write=not Compiler.dry_run)
+
+        header = self.pch_header(target) if len(sources) else None
+        pch = self.pch_path(header) if header is not None else None
+        pch_planned = False
+        if header is not None:
+            pch_command = self.pch_command(header, pch, self.compile_template(target, pic=pic, pch=False))
+            pch_obj = self.pch_object(header)
+            reason = 'forced' if force else deps_db.check(pch, pch_command)
+            if not reason and generated:
+                reason = 'generated inputs might change'
+            if reason:
+                async def do_pch():
+                    if generated and not force and not deps_db.check(pch, pch_command):
+                        self._logger.debug(f'{pch} is up-to-date')
+                        return
+                    self._logger.info(f'precompiling {header.name} ({target})')
+                    snapshot = deps_db.snapshot(pch, [header])
+                    try:
+                        result = await self.run_object_command(pch_command)
+                    except ProcessError as err:
+                        raise CompileError(err)
+                    if pch_obj is not None:
+                        stat_cache.invalidate(pch_obj)
+                    deps_db.record(pch, {header, *self.object_deps(header, pch, result)}, pch_command, snapshot)
+
+                actions.append(Action('pch', target, pch, reason, do_pch, deps_db,
+                                      memory=(target.memory_estimate or 0) << 20))
+                pch_planned = True
+            if pch_obj is not None:
+                objs.add(pch_obj)
+
+        # objects have to be checked again when their inputs are produced by the build
+        recheck = generated or pch_planned
+        for source in sources:
             out = output / source.with_suffix(self.object_extension).name
             objs.add(out)
-            source_deps = self.source_deps(target, source)
-            if force or not out.exists() or (source.lstat().st_mtime > out.lstat().st_mtime) \
-                    or (self._is_source_outdated(target, source, source_deps)):
+            command = [*template, *self.object_files(source, output)]
+            reason = 'forced' if force else deps_db.check(out, command)
+            if not reason and generated:
+                reason = 'generated inputs might change'
+            if not reason and pch_planned:
+                reason = 'precompiled header outdated'
+            if reason:
+                async def do_compile(source=source, out=out, command=command):
+                    if recheck and not force and not deps_db.check(out, command):
+                        self._logger.debug(f'object {out} is up-to-date')
+                        return
+                    snapshot = deps_db.snapshot(out, [source])
+                    cache_key = object_cache.key(source, command, self.toolchain.id) if object_cache else None
+                    deps = object_cache.fetch(cache_key, out) if cache_key else None
+                    if deps is not None:
+                        self._logger.info(f'{out.name} fetched from cache ({target})')
+                        self.fetched += 1
+                    else:
+                        self._logger.info(f'compiling {out.name} ({target})')
+                        try:
+                            result = await self.run_object_command(command)
+                        except ProcessError as err:
+                            raise CompileError(err)
+                        self.compiled += 1
+                        if getattr(result, 'wall_time', None) is not None:
+                            self.statistics.record(out, source, result.wall_time, result.max_rss,
+                                                   out.stat().st_size if out.exists() else None)
+                        deps = {source, *self.object_deps(source, out, result)}
+                        if pch is not None:
+                            deps.add(pch)
+                        if cache_key:
+                            object_cache.store(cache_key, out, deps)
+                    deps_db.record(out, deps, command, snapshot)
+
+                actions.append(Action('compile', target, out, reason, do_compile, deps_db,
+                                      memory=self.memory_estimate(target, out),
+                                      duration=self.statistics.last(out, 'wall'), statistics=self.statistics))
+            else:
+                self._logger.debug(f'object {out} is up-to-date')
 
-                async def do_compile():
-                    self._logger.info(f'compiling {out.name} ({target})')
-                    await self.compile_object(source, output, opts, pic=pic)
-                    self._update_deps_timestamps(target, source, source_deps)
+        if isinstance(target, Library) and target.is_header_only:
+            return actions
 
-                compilations.add(do_compile())
-            else:
-                self._logger.info(f'object {out} is up-to-date')
-        try:
-            await asyncio.gather(*compilations)
-        except ProcessError as err:
-            raise CompileError(err)
-
-        if len(compilations):
-            opts = [*self.toolchain.link_flags]
-            output = target.bin_path.absolute()
-            output.parent.mkdir(exist_ok=True, parents=True)
-            opts.extend(self.make_link_dirs_option(target.library_dirs))
-            lib_names = []
+        link_opts = self.target_link_options(target)
+        link_output = target.bin_path.absolute()
+
+        # libraries order is not deterministic (collected from sets)
+        link_command = sorted([*link_opts, *(str(o) for o in objs)])
+        reason = 'forced' if force else deps_db.check(link_output, link_command)
+        compiles = [action for action in actions if action.kind == 'compile']
+        if not reason and compiles:
+            reason = f'{len(compiles)} object(s) outdated'
+        if not reason and not (isinstance(target, Library) and target.static):
             for lib in target.lib_dependencies:
-                if isinstance(lib, str):
-                    lib_names.append(lib)
-                elif not lib.is_header_only:
-                    lib_names.append(lib.name)
-            opts.extend(self.make_link_option(lib_names))
+                if lib in rebuilt:
+                    reason = f'{lib} outdated'
+                    break
+
+        if not reason:
+            self._logger.debug(f'{link_output.name} is up-to-date')
+            return actions
+
+        async def do_link():
+            # objects/libraries might be unchanged after their rebuild
+            if not force and not deps_db.check(link_output, link_command):
+                self._logger.info(f'{link_output.name} is up-to-date')
+                return
+            link_output.parent.mkdir(exist_ok=True, parents=True)
+            inputs = self._link_inputs(target, objs)
+            snapshot = deps_db.snapshot(link_output, inputs)
             try:
-                if isinstance(target, Library) and not target.is_header_only:
+                if isinstance(target, Library):
                     if target.shared:
-                        self._logger.info(f'creating library {output.name}')
-                        await self.create_shared_lib(output, objs, list(opts), pic=pic, lib_path=target.lib_path)
+                        self._logger.info(f'creating library {link_output.name}')
+                        await self.create_shared_lib(link_output, objs, list(link_opts), pic=pic,
+                                                     lib_path=target.lib_path)
                     else:
-                        self._logger.info(f'creating static library {output.name}')
-                        await self.create_static_lib(output, objs, None)
+                        self._logger.info(f'creating static library {link_output.name}')
+                        await self.create_static_lib(link_output, objs, None)
                 else:
                     # executable
-                    self._logger.info(f'linking {output.name}')
-                    if self.is_clang():
-                        opts.append(f'-stdlib={config.toolchain.libcxx}')
-                    await self.link_executable(output, objs, list(opts), pic=pic)
+                    self._logger.info(f'linking {link_output.name}')
+                    await self.link_executable(link_output, objs, list(link_opts), pic=pic)
             except ProcessError as err:
                 raise CompileError(err)
+            self.linked += 1
+            deps_db.record(link_output, inputs, link_command, snapshot)
+
+        kind = 'link' if not isinstance(target, Library) or target.shared else 'archive'
+        actions.append(Action(kind, target, link_output, reason, do_link, deps_db))
+        return actions
 
-        target._built = len(compilations)
-        return target._built
+    @staticmethod
+    def _link_inputs(target, objs):
+        """Files that target link step depends on (objects and built libraries)"""
+        from cpppm import Library
+        inputs = set(objs)
+        if isinstance(target, Library) and target.static:
+            return inputs
+        for lib in target.lib_dependencies:
+            if isinstance(lib, Library) and not lib.is_header_only \
+                    and lib.lib_path is not None and lib.lib_path.exists():
+                inputs.add(lib.lib_path.absolute())
+        return inputs
 
 
 class UnixCompiler(Compiler):
@@ -216,23 +462,56 @@ class UnixCompiler(Compiler):
     def make_link_option(self, libs):
         return [f'-l{lib}' for lib in libs]
 
-    async def compile_object(self, source, output_path, flags=None, test=False, pic=False):
-        opts = self.toolchain.cxx_flags
-        if pic:
-            opts.append('-fPIC')
-        if flags:
-            opts.extend(flags)
+    def object_flags(self, flags=None, pic=False):
+        return (*self.toolchain.cxx_flags, *(('-fPIC',) if pic else ()), *(flags or ()))
+
+    def object_files(self, source, output_path):
         out = output_path / source.with_suffix('.o').name
-        return await self.cxx_runner.run(*opts, '-c', str(source), '-o', str(out), always_return=test)
+        return '-MMD', '-MF', str(out.with_suffix('.d')), '-c', str(source), '-o', str(out)
+
+    async def run_object_command(self, command, test=False):
+        return await self.cxx_runner.run(*command, always_return=test)
+
+    def pch_path(self, header):
+        return header.with_name(header.name + ('.pch' if self.is_clang() else '.gch'))
+
+    def pch_command(self, header, pch, flags):
+        return [*flags, '-x', 'c++-header', str(header), '-MMD', '-MF', str(pch.with_suffix('.d')), '-o', str(pch)]
+
+    def pch_use_flags(self, header, pch):
+        if self.is_clang():
+            return '-include-pch', str(pch)
+        # gcc looks for header.gch next to the included header
+        return '-include', str(header), '-Winvalid-pch'
+
+    @staticmethod
+    def parse_depfile(content):
+        """Parse make-like dependency file content (as generated by -MMD)"""
+        content = content.replace('\\\r\n', ' ').replace('\\\n', ' ')
+        deps = list()
+        for line in content.splitlines():
+            _, sep, prerequisites = line.partition(': ')
+            if not sep:
+                continue
+            for m in re.finditer(r'((?:\\.|[^\s\\])+)', prerequisites):
+                deps.append(re.sub(r'\\(.)', r'\1', m.group(1).replace('$$', '$')))
+        return deps
+
+    def object_deps(self, source, obj, result):
+        try:
+            content = obj.with_suffix('.d').read_text()
+        except OSError:
+            return set()
+        return {Path.cwd() / dep for dep in self.parse_depfile(content)}
 
     async def create_static_lib(self, output, objs, flags=None):
-        await self.ar_runner.run('rcs', str(output), [str(o) for o in objs])
+        await self.ar_runner.run('rcs', str(output), *[str(o) for o in objs])
 
     async def create_shared_lib(self, output, objs, flags=None, pic=False, **kwargs):
         flags = flags or []
         if pic:
             flags.append('-fPIC')
-        await self.link_runner.run('-shared', *flags, *[str(o) for o in objs], '-o', str(output))
+        await self.link_runner.run('-shared', *[str(o) for o in objs], *flags, '-o', str(output))
 
     async def link_executable(self, output, objs, flags=None, pic=False):
         flags = flags or []
@@ -263,13 +542,52 @@ class MsvcCompiler(Compiler):
     def make_link_option(self, libs):
         return [f'{lib}.lib' for lib in libs]
 
-    async def compile_object(self, source, output_path, flags=None, test=False, pic=False):
-        opts = self.toolchain.cxx_flags
-        if flags:
-            opts.extend(flags)
+    _include_note = 'Note: including file:'
+
+    def object_flags(self, flags=None, pic=False):
+        return ('/nologo', *self.toolchain.cxx_flags, *(flags or ()), '/showIncludes')
+
+    def object_files(self, source, output_path):
         out = output_path / source.with_suffix(self.object_extension).name
-        return await self.cxx_runner.run('/nologo', *opts, '/c', str(source.as_posix()), f'/Fo{str(out.as_posix())}',
-                                         always_return=test)
+        return '/c', str(source.as_posix()), f'/Fo{str(out.as_posix())}'
+
+    def pch_path(self, header):
+        return header.with_suffix('.pch')
+
+    def pch_object(self, header):
+        return header.with_suffix(self.object_extension)
+
+    def pch_header(self, target):
+        header = super().pch_header(target)
+        if header is not None and not Compiler.dry_run:
+            # /Yc needs a source file to compile
+            write_if_changed(header.with_suffix('.cpp'), '// precompiled header source\n')
+        return header
+
+    def pch_command(self, header, pch, flags):
+        return [*flags, f'/Yc{header.as_posix()}', f'/Fp{pch.as_posix()}', f'/FI{header.as_posix()}',
+                '/c', str(header.with_suffix('.cpp').as_posix()), f'/Fo{self.pch_object(header).as_posix()}']
+
+    def pch_use_flags(self, header, pch):
+        return f'/Yu{header.as_posix()}', f'/Fp{pch.as_posix()}', f'/FI{header.as_posix()}'
+
+    async def run_object_command(self, command, test=False):
+        result = await self.cxx_runner.run(*command, stdout=asyncio.subprocess.PIPE, always_return=True)
+        rc, stdout, err = result
+        stdout = stdout.decode(errors='replace')
+        messages = '\n'.join(line for line in stdout.splitlines() if not line.startswith(self._include_note))
+        if rc and not test:
+            raise ProcessError(messages + err.decode(errors='replace'))
+        elif messages:
+            # source file name and diagnostics (cl writes them on stdout)
+            self._logger.info(messages)
+        return ProcessResult(rc, stdout, err, result.pid, result.wall_time, result.usage)
+
+    def object_deps(self, source, obj, result):
+        _, stdout, _ = result
+        note_len = len(self._include_note)
+        return {Path(line[note_len:].strip()) for line in stdout.splitlines()
+                if line.startswith(self._include_note)}
 
     async def create_static_lib(self, output, objs, flags=None):
         await self.ar_runner.run('/nologo', *[f'{o.as_posix()}' for o in objs], f'/OUT:{str(output.as_posix())}')
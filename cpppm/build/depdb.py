@@ -0,0 +1,123 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Union
+
+from cpppm.utils.files import stat_cache
+from cpppm.utils.sha import file_sha1
+from cpppm.utils.store import JsonStore
+
+
+def _stat(path: Union[str, Path]):
+    return stat_cache.stat(path)
+
+
+def _record(path: Union[str, Path]):
+    st = _stat(path)
+    if st is None:
+        return None
+    return [st.st_mtime_ns, st.st_size, file_sha1(path, st)]
+
+
+class InputsSnapshot:
+    """Inputs state taken just before running the action that reads them
+
+    Inputs might be modified while the action runs: their state once it is done is not the one
+    the output has been built from. An input modified since the snapshot, or unknown beforehand
+    (eg.: discovered header) and modified after the action started, is recorded as unknown,
+    so that the output is rebuilt next time.
+    """
+
+    def __init__(self, paths: Iterable[Union[str, Path]]):
+        self.started = time.time_ns()
+        self._records = {str(path): self._current(str(path)) for path in paths}
+
+    @staticmethod
+    def _stat(path: str):
+        # not from the stat cache, filled before the action
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def _current(self, path: str):
+        st = self._stat(path)
+        return [st.st_mtime_ns, st.st_size, file_sha1(path, st)] if st is not None else None
+
+    def get(self, path: Union[str, Path]):
+        """Record of path, as read by the action (None if unknown)"""
+        path = str(path)
+        st = self._stat(path)
+        if st is None:
+            return None
+        if path in self._records:
+            before = self._records[path]
+            return before if before is not None and before[:2] == [st.st_mtime_ns, st.st_size] else None
+        if st.st_mtime_ns >= self.started:
+            return None
+        return [st.st_mtime_ns, st.st_size, file_sha1(path, st)]
+
+
+class DependencyDatabase(JsonStore):
+    """Records the inputs of each build output
+
+    Each output is mapped to the set of files it has been built from, with their
+    modification time, size and content hash at build time. The whole database is
+    loaded once, and written back atomically by `save` only if modified.
+
+    When an input modification time changes but not its content (eg.: git checkout),
+    the record is refreshed and the output is still considered as up-to-date.
+
+    A command signature can also be recorded, so that an output is rebuilt when the
+    command used to produce it changes.
+    """
+    version = 3
+
+    @staticmethod
+    def signature(command: Iterable[str]) -> str:
+        return hashlib.sha1('\0'.join(command).encode()).hexdigest()
+
+    def check(self, output: Path, command: Iterable[str] = None) -> Union[str, None]:
+        """Check if given output is up-to-date
+
+        :return: The reason why output is outdated, None if up-to-date.
+        """
+        if _stat(output) is None:
+            return 'output missing'
+        entry = self._entries.get(str(output))
+        if entry is None:
+            return 'no dependency record'
+        if command is not None and entry['command'] != self.signature(command):
+            return 'command changed'
+        for path, recorded in entry['inputs'].items():
+            st = _stat(path)
+            if st is None or recorded is None:
+                return f'{path} changed'
+            if [st.st_mtime_ns, st.st_size] == recorded[:2]:
+                continue
+            if st.st_size != recorded[1] or file_sha1(path, st) != recorded[2]:
+                return f'{path} changed'
+            recorded[0] = st.st_mtime_ns
+            self._dirty = True
+        return None
+
+    def snapshot(self, output: Path, inputs: Iterable[Path] = ()) -> InputsSnapshot:
+        """Snapshot the known inputs of output (given ones and previously recorded ones) before building it"""
+        return InputsSnapshot({*(str(path) for path in inputs), *self._entries.get(str(output), {}).get('inputs', ())})
+
+    def record(self, output: Path, inputs: Iterable[Path], command: Iterable[str] = None,
+               snapshot: InputsSnapshot = None):
+        """Record output inputs, in their state before building output when snapshotted"""
+        self._entries[str(output)] = {
+            'inputs': {str(path): snapshot.get(path) if snapshot is not None else _record(path) for path in inputs},
+            'command': self.signature(command) if command is not None else None
+        }
+        self._dirty = True
+
+    def inputs(self, output: Path = None):
+        """Recorded inputs of output (of all outputs if None)"""
+        if output is None:
+            return list({Path(p) for entry in self._entries.values() for p in entry['inputs']})
+        entry = self._entries.get(str(output))
+        return [Path(p) for p in entry['inputs']] if entry else []
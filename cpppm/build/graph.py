@@ -0,0 +1,222 @@
+import asyncio
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+from cpppm import _logger
+from cpppm.build.actions import Action
+from cpppm.utils.files import stat_cache
+from cpppm.utils.jobs import job_priority, job_memory
+from cpppm.utils.trace import tracer
+
+
+def _lib_closure(target: 'cpppm.Target') -> List['cpppm.Target']:
+    """Targets the given target links to (recursively)"""
+    from cpppm.target import Target
+    out = list()
+    seen = set()
+
+    def visit(t):
+        for lib in t.link_libraries:
+            if isinstance(lib, Target) and lib not in seen:
+                seen.add(lib)
+                out.append(lib)
+                visit(lib)
+
+    visit(target)
+    return out
+
+
+class BuildGraph:
+    """Build actions dependency graph
+
+    Edges are explicit:
+    - compilations and header precompilations wait for the generators of their target and of the libraries
+      it links to,
+    - compilations wait for their target precompiled header,
+    - links wait for their target compilations and for the links of the libraries it links to,
+    - generators wait for the targets they depend on.
+
+    Each action is given the length of the longest path from it to the end of the build as priority
+    (critical path, weighted by the actions expected durations), so that queued jobs delaying the build
+    completion the most are started first.
+
+    :param targets: Targets to build (with the libraries they link to).
+    :param force: Rebuild everything.
+    :param changes: Files known to be the only ones modified since previous build (eg.: by a watcher),
+        so that other files cached metadata can be kept (None: unknown, the cache is cleared).
+    """
+
+    def __init__(self, targets: Iterable['cpppm.Target'], force=False, changes: Iterable[Path] = None):
+        self._logger = _logger.getChild('graph')
+        # files metadata are cached for the build
+        if changes is None:
+            stat_cache.clear()
+        else:
+            for path in changes:
+                stat_cache.invalidate(path)
+        self._closures: Dict['cpppm.Target', List['cpppm.Target']] = dict()
+        self.targets = self._order(targets, self._closure)
+        self.actions: List[Action] = list()
+        rebuilt = set()
+        generators = set()
+        for target in self.targets:
+            if target._built:
+                continue
+            for action in target.plan(force=force, rebuilt=rebuilt):
+                if action.kind == 'generator':
+                    # a generator may be attached to several targets
+                    if action.func in generators:
+                        continue
+                    generators.add(action.func)
+                if action.kind in {'archive', 'link'}:
+                    rebuilt.add(target)
+                self.actions.append(action)
+        self._connect()
+        self._prioritize()
+
+    def _closure(self, target: 'cpppm.Target') -> List['cpppm.Target']:
+        """Libraries target links to (recursively), computed once per graph"""
+        closure = self._closures.get(target)
+        if closure is None:
+            closure = self._closures[target] = _lib_closure(target)
+        return closure
+
+    @staticmethod
+    def _order(targets: Iterable['cpppm.Target'], closure=_lib_closure) -> List['cpppm.Target']:
+        """Sort targets so that they come after the libraries they link to"""
+        ordered = dict()
+        for target in targets:
+            for lib in reversed(closure(target)):
+                ordered.setdefault(lib)
+            ordered.setdefault(target)
+        return list(ordered)
+
+    @staticmethod
+    def weight(action: Action) -> float:
+        """Estimated cost of an action: its expected duration (recorded by previous builds), else 1 second"""
+        return action.duration if action.duration is not None else 1.0
+
+    def _connect(self):
+        generators: Dict[object, Action] = dict()
+        by_target: Dict['cpppm.Target', List[Action]] = dict()
+        for action in self.actions:
+            by_target.setdefault(action.target, []).append(action)
+            if action.kind == 'generator':
+                generators[action.func] = action
+
+        def target_generators(t):
+            return [generators[evt] for evt in t._dependencies.events if evt in generators]
+
+        def target_links(t):
+            return [a for a in by_target.get(t, []) if a.kind in {'archive', 'link'}]
+
+        for action in self.actions:
+            target = action.target
+            closure = self._closure(target)
+            if action.kind == 'generator':
+                from cpppm.target import Target
+                for dep in action.func.event.depends:
+                    if isinstance(dep, Target):
+                        for t in [*self._closure(dep), dep]:
+                            action.depends.extend(target_links(t))
+            elif action.kind in {'compile', 'pch'}:
+                for t in [target, *closure]:
+                    action.depends.extend(target_generators(t))
+                if action.kind == 'compile':
+                    action.depends.extend(a for a in by_target[target] if a.kind == 'pch')
+            elif action.kind in {'archive', 'link'}:
+                action.depends.extend(a for a in by_target[target] if a.kind in {'compile', 'pch'})
+                action.depends.extend(target_generators(target))
+                if action.kind == 'link':
+                    for t in closure:
+                        action.depends.extend(target_links(t))
+
+        for action in self.actions:
+            action.depends = list(dict.fromkeys(action.depends))
+            for dep in action.depends:
+                dep.dependents.append(action)
+
+    def _prioritize(self):
+        state: Dict[Action, bool] = dict()
+
+        def visit(action):
+            if state.get(action) is False:
+                raise RuntimeError(f'Dependency cycle detected: {action}')
+            if action in state:
+                return action.priority
+            state[action] = False
+            action.priority = self.weight(action) + max((visit(d) for d in action.dependents), default=0.0)
+            state[action] = True
+            return action.priority
+
+        for action in self.actions:
+            visit(action)
+
+    @property
+    def critical_path(self) -> List[Action]:
+        path = list()
+        candidates = [a for a in self.actions if not a.depends]
+        while candidates:
+            action = max(candidates, key=lambda a: a.priority)
+            path.append(action)
+            candidates = action.dependents
+        return path
+
+    async def run(self) -> bool:
+        """Run actions as soon as their dependencies are done
+
+        Dependency databases are saved as soon as their target is built, build statistics once done.
+
+        :return: True if something has been run.
+        """
+        remaining: Dict['cpppm.Target', Set[Action]] = {target: set() for target in self.targets}
+        for action in self.actions:
+            remaining[action.target].add(action)
+        for target, actions in remaining.items():
+            if not actions:
+                target._built = True
+
+        tasks: Dict[Action, asyncio.Future] = dict()
+
+        async def run_action(action: Action):
+            await asyncio.gather(*(task(dep) for dep in action.depends))
+            job_priority.set(action.priority)
+            job_memory.set(action.memory)
+            with tracer.span(action.name, action.kind, target=action.target, reason=action.reason):
+                await action.run()
+            if action.kind == 'generator':
+                # generated files are unknown
+                stat_cache.clear()
+            else:
+                stat_cache.invalidate(action.output)
+            target_actions = remaining[action.target]
+            target_actions.discard(action)
+            if not target_actions:
+                self._save(action.target)
+                action.target._built = True
+
+        def task(action: Action) -> asyncio.Future:
+            if action not in tasks:
+                tasks[action] = asyncio.ensure_future(run_action(action))
+            return tasks[action]
+
+        if self.actions:
+            self._logger.debug(f'critical path: {" -> ".join(a.name for a in self.critical_path)}')
+        try:
+            await asyncio.gather(*(task(action) for action in self.actions))
+        except BaseException:
+            for pending in tasks.values():
+                pending.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            for target in self.targets:
+                self._save(target)
+            for statistics in {action.statistics for action in self.actions if action.statistics is not None}:
+                statistics.save()
+        return len(self.actions) > 0
+
+    def _save(self, target: 'cpppm.Target'):
+        for database in {action.database for action in self.actions
+                         if action.target is target and action.database is not None}:
+            database.save()
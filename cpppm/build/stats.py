@@ -0,0 +1,52 @@
+import time
+from pathlib import Path
+from typing import Dict, List, Union
+
+from cpppm.utils.store import JsonStore
+
+
+class BuildStatistics(JsonStore):
+    """Per translation unit compilation statistics history
+
+    For each object, the last `history_size` compilations wall time (seconds), peak memory (bytes)
+    and object size (bytes) are kept, along with the compiled source.
+    """
+    version = 1
+    history_size = 10
+
+    def record(self, output: Path, source: Path, wall_time: float, max_rss: int = None, size: int = None):
+        entry = self._entries.setdefault(str(output), {'source': str(source), 'history': []})
+        entry['source'] = str(source)
+        entry['history'].append({'date': time.time(), 'wall': wall_time, 'rss': max_rss, 'size': size})
+        del entry['history'][:-self.history_size]
+        self._dirty = True
+
+    def history(self, output: Union[Path, str]) -> List[Dict]:
+        entry = self._entries.get(str(output))
+        return entry['history'] if entry else []
+
+    def last(self, output: Union[Path, str], key: str):
+        """Get last recorded value of key (wall, rss or size) for output, None if unknown"""
+        for record in reversed(self.history(output)):
+            if record.get(key) is not None:
+                return record[key]
+        return None
+
+    def trend(self, output: Union[Path, str], key: str) -> Union[float, None]:
+        """Get last value of key relative to the mean of the previous ones (eg.: 0.1 for +10%)"""
+        values = [record[key] for record in self.history(output) if record.get(key) is not None]
+        if len(values) < 2:
+            return None
+        previous = sum(values[:-1]) / (len(values) - 1)
+        return (values[-1] - previous) / previous if previous else None
+
+    def top(self, key: str, count: int = 10) -> List[Dict]:
+        """Get the count outputs having the highest last value of key"""
+        rows = list()
+        for output, entry in self._entries.items():
+            value = self.last(output, key)
+            if value is not None:
+                rows.append({'output': output, 'source': entry['source'], key: value,
+                             'trend': self.trend(output, key)})
+        rows.sort(key=lambda row: row[key], reverse=True)
+        return rows[:count]
@@ -0,0 +1,50 @@
+from itertools import groupby
+from pathlib import Path
+from typing import List
+
+from cpppm.config import config
+from cpppm.utils.files import write_if_changed
+
+
+def unity_sources(target: 'cpppm.Target', write=True) -> List[Path]:
+    """Get the sources to compile for target
+
+    When unity build is enabled (by target or configuration), sources are merged into generated
+    batches (build/unity/<target>/<target>-unity-<ext>-<n>.<ext>, the extension is part of the stem
+    so that C and C++ batches objects do not collide) including up to `unity_batch_size` sources each.
+    Batches are only rewritten when their content changes.
+    Excluded sources (see Target.unity_exclude) are compiled separately.
+
+    :param write: Write batches and remove outdated ones (not when only planning).
+    """
+    sources = target.compile_sources.absolute()
+    enabled = target.unity_build if target.unity_build is not None else config.unity_build
+    if not enabled:
+        return sources
+
+    batch_size = max(1, target.unity_batch_size or config.unity_batch_size)
+    excluded = set(target.unity_exclude.absolute())
+    out = [source for source in sources if source in excluded]
+    merged = sorted((source for source in sources if source not in excluded), key=lambda s: (s.suffix, str(s)))
+
+    unity_path = target.build_path.absolute() / 'unity' / target.name
+    batches = set()
+    for suffix, group in groupby(merged, key=lambda s: s.suffix):
+        group = list(group)
+        for index in range(0, len(group), batch_size):
+            batch = group[index:index + batch_size]
+            if len(batch) == 1:
+                out.extend(batch)
+                continue
+            path = unity_path / f'{target.name}-unity-{suffix[1:]}-{index // batch_size}{suffix}'
+            if write:
+                write_if_changed(path, ''.join(f'#include "{source.as_posix()}"\n' for source in batch))
+            batches.add(path)
+            out.append(path)
+
+    # remove batches of previous configurations
+    if write and unity_path.exists():
+        for path in unity_path.iterdir():
+            if path not in batches:
+                path.unlink()
+    return out
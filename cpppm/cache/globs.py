@@ -0,0 +1,100 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+from cpppm.utils.store import JsonStore
+
+
+class GlobCache(JsonStore):
+    """Glob results snapshots
+
+    A glob result only depends on the listing of some directories: the root and the directories matched
+    by each leading part of the pattern (the whole tree for recursive patterns). A snapshot is reused
+    while none of these directories modification time changed (adding, removing or renaming an entry
+    updates its directory modification time).
+
+    Snapshots taken while a directory was just modified are not kept, as a further modification
+    within the filesystem timestamp granularity would go unnoticed.
+
+    An excluded directory (the build root when config.glob_exclude_build is set) is neither matched
+    nor watched: as its content changes on each build, globs walking it are never reused.
+    """
+    version = 1
+    racy_delay = 2.0
+
+    def __init__(self, path: Path = None):
+        self.hits = 0
+        self.misses = 0
+        super().__init__(path)
+
+    @staticmethod
+    def directories(root: Path, pattern: str, exclude: Path = None) -> List[Path]:
+        """Directories whose listing a glob of pattern from root depends on"""
+        directories = [root]
+        current = [root]
+        for part in Path(pattern).parts[:-1]:
+            if part == '**':
+                for top in current:
+                    for base, dirs, _files in os.walk(top):
+                        dirs[:] = [d for d in dirs if Path(base) / d != exclude]
+                        directories.extend(Path(base) / d for d in dirs)
+                break
+            current = [p for directory in current for p in directory.glob(part) if p.is_dir() and p != exclude]
+            directories.extend(current)
+        return list(dict.fromkeys(directories))
+
+    @staticmethod
+    def _mtimes(directories: Iterable[Path]) -> Dict[str, Union[int, None]]:
+        mtimes = dict()
+        for directory in directories:
+            try:
+                mtimes[str(directory)] = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtimes[str(directory)] = None
+        return mtimes
+
+    def glob(self, root: Path, pattern: str, exclude: Path = None) -> List[Path]:
+        if exclude is not None and (exclude == root or exclude in root.parents):
+            exclude = None
+        key = f'{root}\0{pattern}\0{exclude or ""}'
+        entry = self._entries.get(key)
+        if entry is not None and self._mtimes(Path(d) for d in entry['dirs']) == entry['dirs']:
+            self.hits += 1
+            return [root / path for path in entry['paths']]
+        self.misses += 1
+        start = time.time_ns()
+        paths = [path for path in root.glob(pattern) if exclude is None or exclude not in path.parents]
+        mtimes = self._mtimes(self.directories(root, pattern, exclude))
+        racy = start - int(self.racy_delay * 1e9)
+        if all(mtime is None or mtime < racy for mtime in mtimes.values()):
+            self._entries[key] = {'dirs': mtimes, 'paths': [str(path.relative_to(root)) for path in paths]}
+            self._dirty = True
+        elif key in self._entries:
+            del self._entries[key]
+            self._dirty = True
+        return paths
+
+
+_glob_cache: GlobCache = None
+
+
+def glob(root: Path, pattern: str) -> List[Path]:
+    """Glob pattern from root using the glob cache
+
+    The build root is excluded (unless root is in it) when config.glob_exclude_build is set.
+    """
+    from cpppm import cache
+    from cpppm.config import config
+    exclude = cache.build_root.absolute() if cache.build_root and config.glob_exclude_build else None
+    return get_glob_cache().glob(root, pattern, exclude)
+
+
+def get_glob_cache() -> GlobCache:
+    """Get the glob cache (persisted in the build root once known)"""
+    global _glob_cache
+    from cpppm import cache
+    path = cache.build_root / 'cpppm-globs.json' if cache.build_root else None
+    if _glob_cache is None or _glob_cache.path != path:
+        _glob_cache = GlobCache(path)
+    return _glob_cache
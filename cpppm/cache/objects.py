@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+from cpppm import _logger
+from cpppm.utils.sha import file_sha1
+
+
+class ObjectCache:
+    """Content addressed object files cache
+
+    Objects are looked up in two steps (like ccache's direct mode):
+    - a manifest, keyed on the source content, the full compile command line
+      and the toolchain, lists the known headers sets with their content hashes,
+    - the object is keyed on the manifest key and the matching headers set hashes.
+
+    Cache size is bounded by evicting least recently used objects (and the manifests entries of evicted objects).
+    """
+    max_manifest_entries = 16
+
+    def __init__(self, root: Path, max_size: int):
+        self.root = root
+        self.max_size = max_size
+        self._logger = _logger.getChild('object-cache')
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    @staticmethod
+    def key(source: Path, command: Iterable[str], toolchain_id: str) -> str:
+        sha = hashlib.sha1(toolchain_id.encode())
+        sha.update('\0'.join(command).encode())
+        sha.update(str(source).encode())
+        sha.update(file_sha1(source).encode())
+        return sha.hexdigest()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f'{key}{suffix}'
+
+    def _load_manifest(self, key: str) -> list:
+        try:
+            with open(self._path(key, '.manifest'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save_manifest(self, key: str, manifest: list):
+        manifest_path = self._path(key, '.manifest')
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, manifest_path)
+
+    @staticmethod
+    def _object_key(key: str, digests: Dict[str, str]) -> str:
+        sha = hashlib.sha1(key.encode())
+        for path in sorted(digests):
+            sha.update(path.encode())
+            sha.update(digests[path].encode())
+        return sha.hexdigest()
+
+    def fetch(self, key: str, output: Path) -> Union[None, Iterable[Path]]:
+        """Copy cached object to output
+
+        :return: The object dependencies on cache hit, None otherwise.
+        """
+        for digests in self._load_manifest(key):
+            try:
+                if any(file_sha1(path) != digest for path, digest in digests.items()):
+                    continue
+            except OSError:
+                continue
+            obj = self._path(self._object_key(key, digests), '.o')
+            try:
+                shutil.copyfile(obj, output)
+                os.utime(obj)
+            except OSError:
+                continue
+            self.hits += 1
+            return [Path(p) for p in digests]
+        self.misses += 1
+        return None
+
+    def store(self, key: str, output: Path, deps: Iterable[Path]):
+        digests = {str(path): file_sha1(path) for path in deps}
+        obj = self._path(self._object_key(key, digests), '.o')
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp = obj.with_suffix(f'.{os.getpid()}.tmp')
+        shutil.copyfile(output, tmp)
+        os.replace(tmp, obj)
+
+        manifest = [entry for entry in self._load_manifest(key) if entry != digests]
+        manifest.insert(0, digests)
+        self._save_manifest(key, manifest[:self.max_manifest_entries])
+        self.stored += 1
+
+    def evict(self):
+        """Remove least recently used objects until cache fits its maximum size"""
+        if not self.stored or not self.root.exists():
+            return
+        entries = []
+        total = 0
+        for path in self.root.glob('*/*.o'):
+            st = path.stat()
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total <= self.max_size:
+            return
+        entries.sort()
+        target_size = self.max_size * 0.9
+        for _, size, path in entries:
+            if total <= target_size:
+                break
+            path.unlink()
+            total -= size
+        self._prune_manifests()
+        self._logger.info(f'cache size reduced to {total // (1 << 20)}MB')
+
+    def _prune_manifests(self):
+        """Remove manifests entries whose object has been evicted (and manifests left empty)"""
+        for manifest_path in self.root.glob('*/*.manifest'):
+            key = manifest_path.stem
+            manifest = self._load_manifest(key)
+            kept = [digests for digests in manifest if self._path(self._object_key(key, digests), '.o').exists()]
+            if not kept:
+                manifest_path.unlink()
+            elif len(kept) != len(manifest):
+                self._save_manifest(key, kept)
+
+    def report(self):
+        self._logger.info(f'{self.hits} hits, {self.misses} misses, {self.stored} stored')
+
+
+_object_cache: ObjectCache = None
+
+
+def get_object_cache() -> Union[None, ObjectCache]:
+    """Get the object cache (None when disabled by configuration)"""
+    global _object_cache
+    from cpppm import cache
+    from cpppm.config import config
+    if not config.object_cache:
+        return None
+    if _object_cache is None:
+        _object_cache = ObjectCache(cache.build_root / 'objects', config.object_cache_size << 20)
+    return _object_cache
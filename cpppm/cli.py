@@ -1,3 +1,4 @@
+import importlib.util
 import logging
 import shutil
 import sys
@@ -9,7 +10,8 @@ import click
 from . import _config_option, _logger
 from .build.compiler import Compiler
 from .project import current_project, root_project, Project
-from .toolchains import available_toolchains, toolchain_keys
+from .toolchains import available_toolchains, toolchain_keys, clear_cache as clear_toolchains_cache
+from .utils.trace import tracer
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
@@ -26,9 +28,12 @@ CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
               help="Config name to use.", default='default')
 @click.pass_context
 def cli(ctx, verbose, out_directory, debug, clean, config):
+    from .cache.globs import get_glob_cache
     from .config import config as cpppm_config
     if not current_project().is_root:
         return
+    # project scripts are evaluated
+    get_glob_cache().save()
     if clean:
         out_directory = Path(out_directory) if out_directory else root_project().build_path
         if out_directory.exists():
@@ -50,36 +55,29 @@ def cli(ctx, verbose, out_directory, debug, clean, config):
         return ctx.invoke(shell or run)
 
 
-try:
-    import IPython
-except ImportError:
-    pass
-
-if 'IPython' in sys.modules:
+# optional dependencies are only imported by their command (slow imports)
+if importlib.util.find_spec('IPython') is not None:
     @cli.command()
     @click.pass_context
     async def interactive(ctx):
         """Interactive python console with loaded project."""
         locals().update({'project': root_project()})
         import asyncio
+        import IPython
         import nest_asyncio
         loop = asyncio.get_event_loop()
         nest_asyncio.apply(loop)
         IPython.embed(using='asyncio')
 
 
-try:
-    import click_shell
-except ImportError:
-    pass
-
-if 'click_shell' in sys.modules:
+if importlib.util.find_spec('click_shell') is not None:
     @cli.command()
     @click.pass_context
     async def shell(ctx):
         """Interactive shell (cli commands in shell mode)."""
 
         import asyncio
+        import click_shell
         import nest_asyncio
         from functools import update_wrapper
         loop = asyncio.get_event_loop()
@@ -149,16 +147,19 @@ async def toolchain_names():
 
 @toolchain_group.command('list')
 @click.option('-v', '--verbose', help='Verbose toolchains', is_flag=True)
+@click.option('-r', '--refresh', help='Refresh toolchains cache', is_flag=True)
 @click.argument('name', required=False, type=click.Choice(toolchain_keys()))
 @click.argument('version', required=False)
 @click.argument('arch', required=False, nargs=-1)
 @click.pass_context
-async def toolchain_list(ctx, verbose, name, version, arch):
+async def toolchain_list(ctx, verbose, refresh, name, version, arch):
     """Find available toolchains.
 
     \b
     NAME    toolchain name to search (eg.: gcc, clang).
     VERSION version to match (eg.: '>=10.1')."""
+    if refresh:
+        clear_toolchains_cache()
     archs = arch if len(arch) else None
     for toolchain in available_toolchains(name, version, archs):
         current = toolchain.id == ctx.obj.toolchain.id
@@ -208,22 +209,74 @@ async def config_show(ctx, items):
 
 @cli.command()
 @click.option("--force", "-f", help="Forced build", is_flag=True)
-@click.option("--jobs", "-j", help="Number of build jobs", default=None)
+@click.option("--jobs", "-j", help="Number of build jobs (default: cpu count)", type=int, default=None)
+@click.option("--dry-run", "-n", help="Print build actions (and why) without running them", is_flag=True)
+@click.option("--trace", help="Write build events to given file (Chrome trace format)", type=click.Path(), default=None)
 @click.argument("target", required=False)
 @click.pass_context
-async def build(ctx, force, jobs, target):
+async def build(ctx, force, jobs, dry_run, trace, target):
     """Builds the project."""
     source_dir = Path(sys.argv[0]).parent
     click.echo(f"Source directory: {str(source_dir.absolute())}")
     click.echo(f"Build directory: {str(root_project().build_path.absolute())}")
     click.echo(f"Project: {root_project().name}")
     Compiler.force = force
-    rc = await root_project().build(target, jobs)
+    Compiler.dry_run = dry_run
+    if dry_run:
+        actions = root_project().plan(target)
+        for action in actions:
+            click.echo(str(action))
+        click.echo(f'{len(actions)} action(s) to run')
+        return
+    if trace:
+        tracer.start()
+    try:
+        rc = await root_project().build(target, jobs)
+    finally:
+        if trace:
+            tracer.stop()
+            tracer.save(trace)
     if rc != 0:
         click.echo(f'Build failed with return code: {rc}')
         exit(rc)
 
 
+@cli.command()
+@click.pass_context
+async def compdb(ctx):
+    """Generates compile_commands.json (without building)."""
+    click.echo(f'Compilation database: {root_project().write_compile_commands()}')
+
+
+def _format_trend(trend):
+    return f'{trend:+.0%}' if trend is not None else ''
+
+
+@cli.command()
+@click.option("--top", "-n", help="Number of translation units to show", type=int, default=10)
+async def stats(top):
+    """Shows the slowest and most memory-hungry translation units."""
+    from .config import config
+    statistics = config.toolchain.cxx_compiler.statistics
+    slowest = statistics.top('wall', top)
+    if not slowest:
+        click.echo('No compilation statistics recorded yet')
+        return
+    click.secho('Slowest translation units (last build, trend):', fg='yellow')
+    for row in slowest:
+        click.echo(f"{row['wall']:8.2f}s {_format_trend(row['trend']):>6} {row['source']}")
+    hungry = statistics.top('rss', top)
+    if hungry:
+        click.secho('Most memory-hungry translation units (peak RSS, trend):', fg='yellow')
+        for row in hungry:
+            click.echo(f"{row['rss'] / (1 << 20):7.1f}MB {_format_trend(row['trend']):>6} {row['source']}")
+    biggest = statistics.top('size', top)
+    if biggest:
+        click.secho('Biggest objects (size, trend):', fg='yellow')
+        for row in biggest:
+            click.echo(f"{row['size'] / (1 << 10):7.1f}KB {_format_trend(row['trend']):>6} {row['source']}")
+
+
 @cli.command()
 @click.argument("destination", default='dist')
 @click.pass_context
@@ -240,13 +293,34 @@ async def sync(force):
     root_project().pkg_sync(force)
 
 
+def _parse_shard(ctx, param, value):
+    from .testing import parse_shard
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as err:
+        raise click.BadParameter(str(err))
+
+
 @cli.command()
+@click.option("--jobs", "-j", help="Number of concurrent jobs (default: cpu count)", type=int, default=None)
+@click.option("--timeout", help="Kill tests running longer than given seconds", type=float, default=None)
+@click.option("--shard", help="Only run the I-th of N tests subsets (I/N)", callback=_parse_shard, default=None)
+@click.option("--junit", help="Write a JUnit XML report to given file", type=click.Path(), default=None)
+@click.option("--no-cache", help="Run tests even if they passed with the same binaries before", is_flag=True)
 @click.argument("target", required=False)
 @click.pass_context
-async def test(ctx, target):
+async def test(ctx, jobs, timeout, shard, junit, no_cache, target):
     """Runs the unit tests."""
-    await ctx.invoke(build, target=target)
-    await root_project().test(target)
+    from .testing import summary, write_junit
+    await ctx.invoke(build, target=target, jobs=jobs)
+    results = await root_project().test(target, jobs=jobs, timeout=timeout, shard=shard, cache=not no_cache)
+    if junit:
+        write_junit(results, junit)
+    click.echo(summary(results))
+    if not all(result.passed for result in results):
+        exit(1)
 
 
 @cli.command()
@@ -267,3 +341,13 @@ async def debug(ctx, target, args):
     """Debug the given TARGET. ARGS args are passed to the configured debugger."""
     await ctx.invoke(build, target=target)
     await root_project().get_target(target).debug(*args)
+
+
+@cli.command()
+@click.option("--jobs", "-j", help="Number of build jobs (default: cpu count)", type=int, default=None)
+@click.option("--test", "-t", "run_tests", help="Run the unit tests after each build", is_flag=True)
+@click.argument("target", required=False)
+async def watch(jobs, run_tests, target):
+    """Rebuilds TARGET each time one of its sources changes (until interrupted)."""
+    click.echo(f"Build directory: {str(root_project().build_path.absolute())}")
+    await root_project().watch(target, jobs, test=run_tests)
@@ -71,6 +71,11 @@ class PackageLibrary(Library):
     def conan_ref(self):
         return self._infos.conan_ref
 
+    @property
+    def package_folder(self) -> Path:
+        """Package binary folder (named after the package id)"""
+        return self._infos.root
+
     @property
     def is_header_only(self):
         return self._infos.header_only
@@ -78,6 +83,9 @@ class PackageLibrary(Library):
     async def build(self):
         return False
 
+    def plan(self, force=False, rebuilt=()):
+        return []
+
 
 class ConanFile(ConanConanFile):
     project: Project = root_project()
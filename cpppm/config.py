@@ -32,6 +32,14 @@ class Config:
                    str),
         ConfigItem('libcxx', '''C++ standard library (default: 'libstdc++11')''', str),
         ConfigItem('ccache', '''Use ccache if available (default: True)''', bool),
+        ConfigItem('object_cache', '''Use cpppm's content addressed object cache (default: False)''', bool),
+        ConfigItem('object_cache_size', '''Object cache maximum size in MB (default: 5120)''', int),
+        ConfigItem('memory_limit', '''Maximum expected memory of concurrent build jobs in MB (default: 0, unlimited)''',
+                   int),
+        ConfigItem('unity_build', '''Compile targets sources in batches (default: False)''', bool),
+        ConfigItem('unity_batch_size', '''Number of sources per unity build batch (default: 8)''', int),
+        ConfigItem('glob_exclude_build', '''Exclude the build root from globs rooted out of it (default: False,
+                   generated sources can be globbed)''', bool),
     }
 
     def __init__(self):
@@ -40,6 +48,12 @@ class Config:
         self.build_type = 'Release'
         self.libcxx = None
         self.ccache = True
+        self.object_cache = False
+        self.object_cache_size = 5120
+        self.memory_limit = 0
+        self.unity_build = False
+        self.unity_batch_size = 8
+        self.glob_exclude_build = False
 
         self._id = 'default'
         self._conan_compiler = None
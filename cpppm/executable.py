@@ -1,5 +1,6 @@
 import platform
 from pathlib import Path
+from typing import Dict
 
 from .target import Target
 from .utils import Runner
@@ -15,9 +16,14 @@ class Executable(Target):
     def executable_path(self) -> Path:
         return self._bin_path / self.binary
 
+    @property
+    def environment(self) -> Dict[str, str]:
+        """Environment variables needed to run the executable"""
+        return {'LD_LIBRARY_PATH': str(self._lib_path)}
+
     async def run(self, *args, working_directory=None):
         await self.build()
-        runner = Runner(self.executable_path, working_directory, env={'LD_LIBRARY_PATH': str(self._lib_path)})
+        runner = Runner(self.executable_path, working_directory, env=self.environment)
         return await runner.run(*args)
 
     async def debug(self, *args):
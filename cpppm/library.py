@@ -1,8 +1,7 @@
-import asyncio
 import platform
 import re
 from pathlib import Path
-from typing import Set, Union
+from typing import List, Set, Tuple, Union
 
 from .target import Target
 from .utils.pathlist import PathList
@@ -70,11 +69,7 @@ class Library(Target):
 
     @property
     def is_header_only(self) -> bool:
-        pattern = self.header_pattern
-        for source in self.sources:
-            if not re.match(pattern, str(source.as_posix())):
-                return False
-        return True
+        return len(self.compile_sources) == 0
 
     @property
     def public_headers(self) -> PathList:
@@ -91,12 +86,6 @@ class Library(Target):
     def tests(self) -> set:
         return self._tests
 
-    def build(self):
-        if self.is_header_only:
-            return super(Library, self).build_deps()
-        else:
-            return super(Library, self).build()
-
     def _add_test(self, test):
         from . import current_project, Executable
         if isinstance(test, Executable):
@@ -134,12 +123,8 @@ class Library(Target):
         for test in self.tests:
             test.link_libraries = self.tests_backend
 
-    async def test(self):
-        from . import current_project
-        builds = set()
-        for test in self.tests:
-            builds.add(current_project().build(test.name))
-        await asyncio.gather(*builds)
-
-        for test in self.tests:
-            await test.run()
+    async def test(self, timeout: float = None, shard: Tuple[int, int] = None,
+                   cache=True) -> List['TestResult']:
+        """Build and run the library tests (see TestRunner)"""
+        from .testing import run_tests
+        return await run_tests(self.tests, timeout=timeout, shard=shard, cache=cache)
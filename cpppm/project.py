@@ -1,7 +1,7 @@
 import asyncio
 import configparser
+import hashlib
 import importlib.util
-import inspect
 import json
 import os
 import re
@@ -9,17 +9,24 @@ import shutil
 import sys
 
 from pathlib import Path
-from typing import Union, cast, Any, Dict, Set
+from typing import Union, cast, Any, Dict, List, Set, Tuple
 
 import click
-from conans.model.requires import ConanFileReference
 
-from . import _jenv, _get_logger, get_conan
+from . import _get_logger, get_conan, get_jenv, cache
+from .build.actions import Action
+from .build.compdb import export_compile_commands
+from .build.graph import BuildGraph
+from .cache.globs import get_glob_cache
+from .cache.objects import get_object_cache
 from .config import config
 from .executable import Executable
 from .library import Library
 from .target import Target
-from .utils.decorators import classproperty, collectable
+from .utils.decorators import classproperty, collectable, invalidate_collected
+from .utils.files import write_if_changed
+from .utils.sha import file_sha1, prune_file_digests
+from .utils.trace import tracer
 
 __external_load: Union[None, Dict] = None
 
@@ -46,6 +53,7 @@ def load_project(path=Path.cwd(), name=None, source_path=None, build_path=None,
             'settings': settings
         }
     spec.loader.exec_module(module)
+    get_glob_cache().save()
     project = module.project
     if reset_external_load:
         __external_load = None
@@ -69,8 +77,8 @@ class Project:
     build_path: Path = None
     _pkg_libraries: Dict[str, 'cpppm.conans.PackageLibrary'] = dict()
 
-    # export commands from CMake (can be used by clangd)
-    export_compile_commands = False
+    # export compilation database on build (can be used by clangd)
+    export_compile_commands = True
     verbose_makefile = False
     settings = None
 
@@ -86,13 +94,11 @@ class Project:
         self.url = None
         self.description = None
         self._logger = _get_logger(self, name)
-        stack_trace = inspect.stack()
-        module_frame = None
-        for frame in stack_trace:
-            if frame.function == '<module>':
-                module_frame = frame
-                break
-        self.script_path = Path(module_frame[1]).resolve()
+        # the script defining the project is the first module frame
+        module_frame = sys._getframe(1)
+        while module_frame.f_code.co_name != '<module>':
+            module_frame = module_frame.f_back
+        self.script_path = Path(module_frame.f_code.co_filename).resolve()
         self._root_path = source_path or self.script_path.parent.absolute()
 
         # adjust output dir
@@ -213,6 +219,7 @@ class Project:
         executable = Executable(name, *self._target_paths(root), **kwargs)
         self._executables.add(executable)
         self._targets.add(executable)
+        invalidate_collected()
         return executable
 
     def main_library(self, root: str = None, **kwargs) -> Library:
@@ -227,6 +234,7 @@ class Project:
         library = Library(name, *self._target_paths(root), **kwargs)
         self._libraries.add(library)
         self._targets.add(library)
+        invalidate_collected()
         return library
 
     @collectable(subprojects)
@@ -276,6 +284,7 @@ class Project:
 
     @property
     def conan_refs(self):
+        from conans.model.requires import ConanFileReference
         return [ConanFileReference.loads(req) for req in self.requires] + [ConanFileReference.loads(req) for req in
                                                                            self.build_requires]
 
@@ -285,20 +294,21 @@ class Project:
 
     @property
     def uses_conan(self):
-        return bool(len(self.conan_packages))
+        return bool(len(self.requires) or len(self.build_requires))
 
     def pkg_sync(self, force=False):
         conan_file = self.source_path / 'conanfile.py'
         if force or not conan_file.exists() or conan_file.stat().st_mtime < self.last_modified:
             self._logger.info("Updating conanfile.py")
-            open(conan_file, 'w').write(_jenv.get_template('conanfilev2.py.j2').render({'project': self}))
+            open(conan_file, 'w').write(get_jenv().get_template('conanfilev2.py.j2').render({'project': self}))
 
         conan = get_conan()
 
         settings = [f'{k}={v}' for k, v in config.toolchain.conan_settings.items()]
-        _install_infos = conan.install(str(conan_file), cwd=self.build_path,
-                                       settings=settings, env=config.toolchain.env_list,
-                                       build=["outdated"], update=True)
+        with tracer.span('conan install', 'conan', project=self.name):
+            _install_infos = conan.install(str(conan_file), cwd=self.build_path,
+                                           settings=settings, env=config.toolchain.env_list,
+                                           build=["outdated"], update=True)
 
         return conan_file
 
@@ -309,10 +319,15 @@ class Project:
 
         if not self.uses_conan:
             self._logger.info('project has no requirements')
+            self._conan_deps_resolved = True
             return
 
+        from .build.compiler import Compiler
         build_infos_path = self.build_path / 'conanbuildinfo.json'
         if not build_infos_path.exists():
+            if Compiler.dry_run:
+                self._logger.warning('conan packages are not installed (skipped by dry run)')
+                return
             self.pkg_sync()
 
         build_info = json.load(open(self.build_path / 'conanbuildinfo.json', 'r'))
@@ -324,15 +339,21 @@ class Project:
                 pkg_lib = PackageLibrary(info)
                 Project._pkg_libraries[pkg_lib.name] = pkg_lib
 
-        conan = get_conan()
-
         # resolve inter-packages dependencies
-        for pkg_lib in Project._pkg_libraries.values():
-            deps, _conan_file = conan.info(pkg_lib.conan_ref)
-            for edge in deps.nodes:
-                if edge.name == pkg_lib.name:
-                    for dep in edge.dependencies:
-                        pkg_lib.link_libraries = Project._pkg_libraries[dep.dst.name]
+        graph = self._load_conan_graph(build_infos_path)
+        if graph is None:
+            conan = get_conan()
+            graph = dict()
+            for pkg_lib in Project._pkg_libraries.values():
+                with tracer.span(f'conan info {pkg_lib.name}', 'conan', ref=pkg_lib.conan_ref):
+                    deps, _conan_file = conan.info(pkg_lib.conan_ref)
+                graph[pkg_lib.name] = [dep.dst.name for edge in deps.nodes if edge.name == pkg_lib.name
+                                       for dep in edge.dependencies]
+            if not Compiler.dry_run:
+                self._save_conan_graph(build_infos_path, graph)
+        for name, deps in graph.items():
+            for dep in deps:
+                Project._pkg_libraries[name].link_libraries = Project._pkg_libraries[dep]
 
         # resolve targets dependencies
         for target in self.targets:
@@ -340,14 +361,43 @@ class Project:
                 if isinstance(lib, str) and lib in Project._pkg_libraries:
                     target._link_libraries.remove(lib)
                     target._link_libraries.add(Project._pkg_libraries[lib])
+        invalidate_collected()
 
         self._conan_deps_resolved = True
 
+    @property
+    def _conan_graph_path(self) -> Path:
+        return self.build_path / 'cpppm-conan-graph.json'
+
+    def _conan_graph_key(self, build_infos_path: Path) -> str:
+        """Hash of everything the packages graph depends on"""
+        conan_file = self.source_path / 'conanfile.py'
+        inputs = [file_sha1(build_infos_path), file_sha1(conan_file) if conan_file.exists() else None,
+                  sorted(self.requires), sorted(self.build_requires),
+                  self.requires_options, self.options, self.default_options,
+                  config.toolchain.conan_profile_args, config.toolchain.env_list]
+        return hashlib.sha1(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _load_conan_graph(self, build_infos_path: Path) -> Union[Dict[str, List[str]], None]:
+        """Get the packages dependencies resolved by a previous run (None if outdated)"""
+        try:
+            data = json.loads(self._conan_graph_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get('key') != self._conan_graph_key(build_infos_path) \
+                or set(data['graph']) != set(Project._pkg_libraries):
+            return None
+        return data['graph']
+
+    def _save_conan_graph(self, build_infos_path: Path, graph: Dict[str, List[str]]):
+        data = {'key': self._conan_graph_key(build_infos_path), 'graph': graph}
+        write_if_changed(self._conan_graph_path, json.dumps(data, indent=1, sort_keys=True))
+
     @property
     def is_root(self):
         return self.build_path == config._build_path
 
-    async def build(self, target: Union[str, Target] = None, jobs: int = None) -> int:
+    async def build(self, target: Union[str, Target] = None, jobs: int = None, changes: List[Path] = None) -> int:
         self.resolve_dependencies()
 
         if target:
@@ -356,15 +406,104 @@ class Project:
         for t in self.targets:
             t._built = False
 
-        if not target:
-            builds = set()
-            for target in self.targets:
-                builds.add(target.build())
-            await asyncio.gather(*builds)
-        else:
-            await target.build()
+        compiler = config.toolchain.cxx_compiler
+        if jobs:
+            compiler.pool.jobs = jobs
+        compiler.pool.memory_limit = (config.memory_limit or 0) << 20
+        compiler.reset_stats()
+
+        graph = BuildGraph([target] if target else sorted(self.targets, key=lambda t: t.name), changes=changes)
+        await graph.run()
+        compiler.report()
+        if Project.export_compile_commands:
+            self.write_compile_commands()
+        object_cache = get_object_cache()
+        if object_cache:
+            object_cache.report()
+            object_cache.evict()
         return 0
 
+    def plan(self, target: Union[str, Target] = None, force=False) -> List[Action]:
+        """Compute the build actions (without running them)
+
+        Actions are ordered so that targets come after the libraries they link to.
+        Planning runs in dry run mode: no build file is written, no package is installed.
+        """
+        from .build.compiler import Compiler
+        dry_run = Compiler.dry_run
+        Compiler.dry_run = True
+        try:
+            self.resolve_dependencies()
+            if target:
+                targets = [target if isinstance(target, Target) else self.target(target)]
+            else:
+                targets = sorted(self.targets, key=lambda t: t.name)
+
+            return BuildGraph(targets, force=force).actions
+        finally:
+            Compiler.dry_run = dry_run
+
+    def watched_files(self, target: Union[str, Target] = None) -> Set[Path]:
+        """Files whose modification requires a rebuild: sources, recorded dependencies and project scripts
+
+        Files of the build directory (produced by the build itself) are not part of them.
+        """
+        if target:
+            targets = [target if isinstance(target, Target) else self.target(target)]
+        else:
+            targets = self.targets
+        compiler = config.toolchain.cxx_compiler
+        build_root = cache.build_root.absolute()
+        files = {project.script_path for project in Project.projects}
+        from cpppm.conans import PackageLibrary
+        for target in BuildGraph._order(targets):
+            if isinstance(target, PackageLibrary):
+                continue
+            files.update(path.absolute() for path in target.sources)
+            files.update(compiler.dependency_database(target).inputs())
+        return {path for path in files if build_root not in path.parents}
+
+    async def watch(self, target: Union[str, Target] = None, jobs: int = None, test=False):
+        """Rebuild (and test) on every watched files modification, until cancelled
+
+        The project, its toolchain, collected properties and dependency databases are kept loaded,
+        so that only the actions affected by the modified files are run.
+        """
+        from .utils.runner import ProcessError
+        from .utils.watch import get_watcher
+
+        async def cycle(changes=None):
+            try:
+                await self.build(target, jobs, changes=changes)
+                if test:
+                    from .testing import summary
+                    self._logger.info(summary(await self.test(target)))
+            except ProcessError as err:
+                # keep watching, the next modification may fix it
+                self._logger.error(err)
+
+        await cycle()
+        scripts = {project.script_path for project in Project.projects}
+        with get_watcher(self.watched_files(target)) as watcher:
+            self._logger.info(f'watching {len(watcher.files)} file(s)')
+            while True:
+                changes = await watcher.changes()
+                self._logger.info(f'changed: {", ".join(str(path) for path in sorted(changes))}')
+                if changes & scripts:
+                    self._logger.warning('project script changed, restart watch to reload it')
+                await cycle(changes)
+                # new dependencies may have been recorded
+                watcher.update(self.watched_files(target))
+                prune_file_digests(watcher.files)
+
+    def write_compile_commands(self) -> Path:
+        """Write compile_commands.json for all project targets (without compiling)"""
+        self.resolve_dependencies()
+        output = self.build_path / 'compile_commands.json'
+        if export_compile_commands(output, self.targets, config.toolchain.cxx_compiler):
+            self._logger.info(f'{output} updated')
+        return output
+
     async def run(self, target_name: str, *args):
         target = target_name or self.default_executable or self.main_target
         if target is None:
@@ -390,23 +529,22 @@ class Project:
             if t:
                 return t
 
-    async def test(self, target=None):
+    async def test(self, target=None, jobs: int = None, timeout: float = None,
+                   shard: Tuple[int, int] = None, cache=True) -> List['TestResult']:
+        """Build and run the unit tests (of given library, else of all of them)"""
+        if jobs:
+            config.toolchain.cxx_compiler.pool.jobs = jobs
         if target:
             target = self.target(target)
             assert isinstance(target, Library)
             click.secho(f'Running {target} tests', fg='yellow')
-            await target.test()
+            return await target.test(timeout=timeout, shard=shard, cache=cache)
         else:
+            from .testing import run_tests
             tests = set()
-            builds = set()
             for lib in self.libraries:
-                for tst in lib.tests:
-                    builds.add(tst.build())
-                    tests.add(tst)
-            await asyncio.gather(*builds)
-            for tst in tests:
-                click.secho(f'Running {tst.name} test', fg='yellow')
-                await tst.run()
+                tests.update(lib.tests)
+            return await run_tests(tests, timeout=timeout, shard=shard, cache=cache)
 
     def subproject(self, name: str, path: Union[str, Path] = None) -> 'Project':
         if path is None:
@@ -426,6 +564,7 @@ class Project:
         subproject = load_project(path, name)
         Project.current_project = self
         self._subprojects.add(subproject)
+        invalidate_collected()
         return subproject
 
     def set_event(self, func):
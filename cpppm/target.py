@@ -5,12 +5,17 @@ from abc import abstractmethod
 from pathlib import Path
 from typing import List, Set, Tuple, Dict, Union
 
-from .utils.decorators import list_property, dependencies_property, collectable
+from .utils.decorators import list_property, dependencies_property, collectable, collect_version
 from .utils.pathlist import PathList
 
 
 class Target:
     install = True
+    # unity build settings (None: use config)
+    unity_build: bool = None
+    unity_batch_size: int = None
+    # expected compiler peak memory per source in MB (used for memory_limit when no compilation history)
+    memory_estimate: int = None
 
     def __init__(self, name: str, source_path: Path, build_path: Path, **kwargs):
         from .events import Event
@@ -30,6 +35,9 @@ class Target:
         self._link_libraries = set()
         self._compile_options = set()
         self._compile_definitions = dict()
+        self._precompiled_headers = list()
+        self._unity_exclude = PathList(source_path)
+        self._compile_sources = (None, None)
         self.events: List[Event] = []
         self._built = False
         self._build_lock = asyncio.Lock()
@@ -56,11 +64,17 @@ class Target:
 
     @property
     def compile_sources(self) -> PathList:
-        pattern = self.header_pattern
-        out = PathList(self.source_path)
+        # memoized until a list property is assigned
+        version, out = self._compile_sources
+        if version == collect_version():
+            return out
+        pattern = re.compile(self.header_pattern)
+        # derived value: filling it must not invalidate collected values
+        out = PathList(self.source_path, owned=False)
         for source in self.sources:
-            if not re.match(pattern, str(source)):
+            if not pattern.match(str(source)):
                 out.append(source)
+        self._compile_sources = (collect_version(), out)
         return out
 
     @property
@@ -95,6 +109,19 @@ class Target:
                 paths.extend(lib.include_paths)
         return paths
 
+    @list_property
+    def precompiled_headers(self) -> list:
+        """Headers precompiled once and included in all target sources
+
+        Either paths (relative to source_path) or system headers (eg.: '<vector>').
+        """
+        return self._precompiled_headers
+
+    @list_property
+    def unity_exclude(self) -> PathList:
+        """Sources that cannot be merged in unity build batches"""
+        return self._unity_exclude
+
     @list_property
     def subdirs(self) -> PathList:
         return self._subdirs
@@ -105,9 +132,7 @@ class Target:
 
     @collectable(link_libraries, permissive=True)
     def lib_dependencies(self) -> set:
-        if not hasattr(self, '_lib_dependencies'):
-            self._lib_dependencies = copy.copy(self._link_libraries)
-        return self._lib_dependencies
+        return copy.copy(self._link_libraries)
 
     @collectable(link_libraries, permissive=True)
     def compile_options(self) -> set:
@@ -130,35 +155,24 @@ class Target:
             if self._built:
                 return self._built
 
-            outdated = await self.build_deps()
-            from cpppm.config import config
-            return await config.toolchain.cxx_compiler.compile(self, force=force or outdated)
+            from .build.graph import BuildGraph
+            return await BuildGraph([self], force=force).run()
 
-    async def build_deps(self) -> bool:
-        definitions = set()
-        for k, v in self.compile_definitions.items():
-            if v is not None:
-                definitions.add(f'{k}={v}')
-            else:
-                definitions.add(f'{k}')
+    def plan(self, force=False, rebuilt=()) -> List['cpppm.build.actions.Action']:
+        """Compute the actions needed to build the target (without running them)
 
+        :param rebuilt: Targets that are planned to be rebuilt.
+        """
+        from .build.actions import Action
         from .events import generator
-        events_to_wait = set()
-        for evt in self._dependencies.events:
-            if isinstance(evt.event, generator):
-                result = evt()
-                if result and asyncio.iscoroutine(result):
-                    events_to_wait.add(result)
-        await asyncio.gather(*events_to_wait)
-
-        builds = set()
-        for lib in self.link_libraries:
-            from cpppm import Library
-            if isinstance(lib, Library):
-                builds.add(lib.build())
-        results = await asyncio.gather(*builds)
-        built = any(results) if len(results) else False
-        return built
+        actions = [Action('generator', self, evt.event.function_name, 'generators are always run', evt)
+                   for evt in self._dependencies.events if isinstance(evt.event, generator)]
+        from cpppm.config import config
+        from .build.graph import _lib_closure
+        generated = any(isinstance(evt.event, generator)
+                        for t in [self, *_lib_closure(self)] for evt in t._dependencies.events)
+        actions.extend(config.toolchain.cxx_compiler.plan(self, force=force, rebuilt=rebuilt, generated=generated))
+        return actions
 
     @property
     @abstractmethod
@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import json
+import math
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+import click
+
+from .build.stats import BuildStatistics
+from .utils.runner import Runner
+from .utils.sha import file_sha1
+from .utils.store import JsonStore
+
+
+class TestResult:
+    """Outcome of a test executable run
+
+    :param status: 'passed', 'cached' (passed with the same fingerprint before, not run), 'failed', 'timeout'
+        or 'error' (could not be started).
+    """
+    __test__ = False
+
+    def __init__(self, test: 'cpppm.Executable', status: str, duration: float = 0.0, returncode: int = None,
+                 out: bytes = None, err: bytes = None):
+        self.test = test
+        self.status = status
+        self.duration = duration
+        self.returncode = returncode
+        self.out = out or b''
+        self.err = err or b''
+
+    @property
+    def passed(self) -> bool:
+        return self.status in {'passed', 'cached'}
+
+    def __str__(self):
+        return f'{self.status.upper()} {self.test.name} ({self.duration:.2f}s)'
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a shard specification: 'i/n' (1 <= i <= n)"""
+    try:
+        index, count = (int(v) for v in value.split('/'))
+    except ValueError:
+        raise ValueError(f'invalid shard: {value} (expected: i/n)')
+    if not 1 <= index <= count:
+        raise ValueError(f'invalid shard: {value} (expected: 1 <= i <= n)')
+    return index, count
+
+
+def package_fingerprint(folder: Path) -> str:
+    """Identify a conan package binary: its folder (named after the package id) and its manifest
+    (packaged files hashes, changed when the package is rebuilt)"""
+    manifest = folder / 'conanmanifest.txt'
+    return f'{folder}:{file_sha1(manifest) if manifest.exists() else ""}'
+
+
+class TestResultCache(JsonStore):
+    """Fingerprints of the last passing run of each test
+
+    A test fingerprint covers its binary, the shared libraries and conan packages binaries it links to
+    (recursively) and its environment: a test with an unchanged fingerprint would pass again.
+    Other inputs (eg.: data files read by the test) are not known, use --no-cache when they change.
+    """
+    __test__ = False
+    version = 1
+
+    @staticmethod
+    def fingerprint(test: 'cpppm.Executable') -> Union[str, None]:
+        """Get test fingerprint (None if it cannot be computed, eg.: missing binary)"""
+        from .build.graph import _lib_closure
+        from .target import Target
+        sha = hashlib.sha1()
+        try:
+            sha.update(file_sha1(test.executable_path).encode())
+            for lib in sorted(_lib_closure(test), key=lambda lib: lib.name):
+                if hasattr(lib, 'conan_ref'):
+                    sha.update(package_fingerprint(lib.package_folder).encode())
+                elif isinstance(lib, Target) and lib.shared and not lib.is_header_only:
+                    sha.update(file_sha1(lib.bin_path).encode())
+        except OSError:
+            return None
+        sha.update(json.dumps(test.environment, sort_keys=True).encode())
+        return sha.hexdigest()
+
+    def passed(self, test: 'cpppm.Executable', fingerprint: str) -> bool:
+        return fingerprint is not None and self._entries.get(str(test.executable_path)) == fingerprint
+
+    def record(self, test: 'cpppm.Executable', fingerprint: Union[str, None], passed: bool):
+        key = str(test.executable_path)
+        if passed and fingerprint is not None:
+            self._entries[key] = fingerprint
+        elif key in self._entries:
+            del self._entries[key]
+        self._dirty = True
+
+
+class TestRunner:
+    """Concurrent test executables runner
+
+    Tests run concurrently under the shared job pool, the ones that took the longest on previous runs
+    (or never run) first, so that they do not end the session alone.
+    Their output is captured, and only shown on failure.
+
+    :param tests: Test executables (already built).
+    :param statistics: Tests durations history.
+    :param timeout: Seconds after which a test is killed and considered failed.
+    :param shard: (index, count) to only run the index-th of count (name-sorted) tests subsets.
+    :param cache: Results cache, tests that passed with the same fingerprint are not run again.
+    """
+    __test__ = False
+
+    def __init__(self, tests: Iterable['cpppm.Executable'], statistics: BuildStatistics, timeout: float = None,
+                 shard: Tuple[int, int] = None, cache: TestResultCache = None):
+        self.statistics = statistics
+        self.cache = cache
+        self.timeout = timeout
+        self.tests = sorted(tests, key=lambda t: t.name)
+        if shard:
+            index, count = shard
+            self.tests = self.tests[index - 1::count]
+
+    def duration(self, test: 'cpppm.Executable') -> float:
+        """Last recorded test duration (infinite if unknown)"""
+        duration = self.statistics.last(test.executable_path, 'wall')
+        return math.inf if duration is None else duration
+
+    @property
+    def ordered(self) -> List['cpppm.Executable']:
+        return sorted(self.tests, key=self.duration, reverse=True)
+
+    async def run_test(self, test: 'cpppm.Executable') -> TestResult:
+        if self.cache is None:
+            return await self._run_test(test)
+        fingerprint = self.cache.fingerprint(test)
+        if self.cache.passed(test, fingerprint):
+            return TestResult(test, 'cached')
+        result = await self._run_test(test)
+        self.cache.record(test, fingerprint, result.passed)
+        return result
+
+    async def _run_test(self, test: 'cpppm.Executable') -> TestResult:
+        runner = Runner(test.executable_path, env=test.environment)
+        try:
+            result = await runner.run(stdout=subprocess.PIPE, always_return=True, timeout=self.timeout)
+        except OSError as err:
+            return TestResult(test, 'error', err=str(err).encode())
+        rc, out, err = result
+        if result.timed_out:
+            status = 'timeout'
+        else:
+            status = 'passed' if rc == 0 else 'failed'
+            self.statistics.record(test.executable_path, test.name, result.wall_time)
+        return TestResult(test, status, result.wall_time, rc, out, err)
+
+    async def run(self) -> List[TestResult]:
+        results = list()
+
+        async def run_one(test):
+            result = await self.run_test(test)
+            results.append(result)
+            self.show(result)
+
+        try:
+            await asyncio.gather(*(run_one(test) for test in self.ordered))
+        finally:
+            self.statistics.save()
+            if self.cache is not None:
+                self.cache.save()
+        return results
+
+    def show(self, result: TestResult):
+        click.secho(str(result), fg='green' if result.passed else 'red')
+        if not result.passed:
+            for output in result.out, result.err:
+                if output:
+                    click.echo(output.decode(errors='replace').rstrip())
+            if result.status == 'timeout':
+                click.echo(f'{result.test.name} killed after {self.timeout}s')
+
+
+async def run_tests(tests: Iterable['cpppm.Executable'], timeout: float = None, shard: Tuple[int, int] = None,
+                    cache=True) -> List[TestResult]:
+    """Build and run given tests, with current build directory history and results cache"""
+    from .build.graph import BuildGraph
+    from .config import config
+    tests = set(tests)
+    await BuildGraph(tests).run()
+    compiler = config.toolchain.cxx_compiler
+    results_cache = TestResultCache(config._build_path / 'cpppm-test-results.json') if cache else None
+    runner = TestRunner(tests, compiler.test_statistics, timeout=timeout, shard=shard, cache=results_cache)
+    return await runner.run()
+
+
+def summary(results: List[TestResult]) -> str:
+    failed = [r for r in results if not r.passed]
+    cached = sum(r.status == 'cached' for r in results)
+    return f'{len(results) - len(failed)}/{len(results)} test(s) passed' + \
+           (f' ({cached} cached)' if cached else '') + \
+           (f', failed: {", ".join(sorted(r.test.name for r in failed))}' if failed else '')
+
+
+def write_junit(results: List[TestResult], path: Union[str, Path]):
+    """Write test results as a JUnit XML report"""
+    suites = ET.Element('testsuites')
+    suite = ET.SubElement(suites, 'testsuite', name='cpppm', tests=str(len(results)),
+                          failures=str(sum(r.status in {'failed', 'timeout'} for r in results)),
+                          errors=str(sum(r.status == 'error' for r in results)),
+                          time=f'{sum(r.duration for r in results):.3f}')
+    for result in sorted(results, key=lambda r: r.test.name):
+        case = ET.SubElement(suite, 'testcase', name=result.test.name, classname=result.test.name,
+                             time=f'{result.duration:.3f}')
+        if result.status == 'failed':
+            ET.SubElement(case, 'failure', message=f'exit code {result.returncode}')
+        elif result.status == 'timeout':
+            ET.SubElement(case, 'failure', message='timeout')
+        elif result.status == 'error':
+            ET.SubElement(case, 'error', message=result.err.decode(errors='replace'))
+        if result.out:
+            ET.SubElement(case, 'system-out').text = result.out.decode(errors='replace')
+        if result.err:
+            ET.SubElement(case, 'system-err').text = result.err.decode(errors='replace')
+    ET.ElementTree(suites).write(path, encoding='utf-8', xml_declaration=True)
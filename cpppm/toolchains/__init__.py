@@ -13,23 +13,46 @@ def _find_clang_toolchains(archs=None, version=None, **kwargs):
                                           **kwargs)
 
 
+def _get_gcc_toolchain(arch=None, version=None, **kwargs):
+    return toolchain.find_unix_toolchain('gcc', 'g++', 'gdb', arch=arch, version=version, **kwargs)
+
+
+def _get_clang_toolchain(arch=None, version=None, **kwargs):
+    return toolchain.find_unix_toolchain('clang', 'clang++', 'lldb', tools_prefix='llvm', arch=arch, version=version,
+                                         **kwargs)
+
+
 _toolchain_finders = dict()
+_toolchain_resolvers = dict()
 if platform.system() == 'Windows':
     from cpppm.toolchains import msvc
 
     _toolchain_finders['msvc'] = msvc.find_msvc_toolchains
     _toolchain_finders['Visual Studio'] = msvc.find_msvc_toolchains
+    _toolchain_resolvers['msvc'] = msvc.find_msvc_toolchain
+    _toolchain_resolvers['Visual Studio'] = msvc.find_msvc_toolchain
 else:
     _toolchain_finders.update({
         'gcc': _find_gcc_toolchains,
         'clang': _find_clang_toolchains
     })
+    _toolchain_resolvers.update({
+        'gcc': _get_gcc_toolchain,
+        'clang': _get_clang_toolchain
+    })
 
 
 def toolchain_keys():
     return _toolchain_finders.keys()
 
 
+def clear_cache():
+    """Forget persisted toolchains detection results"""
+    toolchain.clear_unix_toolchains_cache()
+    if platform.system() == 'Windows':
+        msvc.clear_msvc_toolchains_cache()
+
+
 def available_toolchains(name=None, version=None, archs=None):
     toolchains = set()
     if not name:
@@ -41,12 +64,15 @@ def available_toolchains(name=None, version=None, archs=None):
 
 
 def get_default():
-    for find in _toolchain_finders.values():
-        toolchain_ = find().pop()
+    for resolve in _toolchain_resolvers.values():
+        toolchain_ = resolve()
         if toolchain_:
             return toolchain_
 
 
 def get(toolchain_id, **kwargs):
     id_ = toolchain.ToolchainId(toolchain_id)
-    return _toolchain_finders[id_.name](version=id_.version, archs=[id_.arch], **kwargs).pop()
+    toolchain_ = _toolchain_resolvers[id_.name](version=id_.version, arch=id_.arch, **kwargs)
+    if toolchain_ is None:
+        raise RuntimeError(f'Toolchain not found: {toolchain_id}')
+    return toolchain_
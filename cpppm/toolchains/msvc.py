@@ -115,6 +115,12 @@ def _gen_msvc_cache(archs):
     return cache_data
 
 
+def clear_msvc_toolchains_cache():
+    cache_ = cache.build_root / 'cpppm-msvc-toolchains.cache'
+    if cache_.exists():
+        cache_.unlink()
+
+
 def find_msvc_toolchains(version=None, archs=None, **kwargs):
     archs = archs or ['x86_64', 'x86']
     toolchains = set()
@@ -159,3 +165,11 @@ def find_msvc_toolchains(version=None, archs=None, **kwargs):
                                  env=vcvars))
 
     return toolchains
+
+
+def find_msvc_toolchain(version=None, arch=None, **kwargs):
+    """Find the msvc toolchain matching version and arch (highest version first)"""
+    toolchains = find_msvc_toolchains(version=version, archs=[arch] if arch else None, **kwargs)
+    if not toolchains:
+        return None
+    return max(toolchains, key=lambda toolchain: (Version(toolchain.version), toolchain.arch))
@@ -1,14 +1,16 @@
+import json
 import logging
+import os
 import re
 import shutil
 from abc import abstractmethod
+from collections import namedtuple
 from pathlib import Path
 
-from conans.client.conf.compiler_id import detect_compiler_id
 from semantic_version import SimpleSpec, Version
 
-from cpppm import detect
-from cpppm.detect import find_executables
+from cpppm import cache, detect
+from cpppm.utils.store import dump_json
 
 
 class ToolchainId:
@@ -23,6 +25,28 @@ class ToolchainId:
         self.arch = m.group('arch')
 
 
+class CompilerId(namedtuple('CompilerId', 'name major minor patch')):
+    """Compiler identification (same interface as conan's one, which is slow to import)"""
+
+    @property
+    def version(self):
+        return f'{self.major}.{self.minor}.{self.patch}'
+
+    @property
+    def major_minor(self):
+        return f'{self.major}.{self.minor}'
+
+    def __str__(self):
+        return f'{self.name} {self.version}'
+
+
+def detect_compiler_id(cc_path) -> CompilerId:
+    """Identify the compiler at cc_path (using conan detection, only imported when probing)"""
+    from conans.client.conf.compiler_id import detect_compiler_id as conan_detect_compiler_id
+    compiler_id = conan_detect_compiler_id(str(cc_path))
+    return CompilerId(compiler_id.name, compiler_id.major, compiler_id.minor, compiler_id.patch)
+
+
 class Toolchain:
     def __init__(self, name, compiler_id, arch, cc, cxx, as_, ar, link, nm=None, ex=None, strip=None, dbg=None,
                  libcxx=None, c_flags=None, cxx_flags=None, link_flags=None, compiler_class=None, env=None):
@@ -42,9 +66,9 @@ class Toolchain:
         self.cxx_flags = cxx_flags or []
         self.link_flags = link_flags or []
         self.compiler_class = compiler_class
+        self._cxx_compiler = None
         self._build_type = None
-        self.conan_profile = None
-        self.conan_settings = None
+        self._conan_profile = None
         if libcxx:
             m = re.match(r'(\w+c\+\+)(\d+)', libcxx)
             if m:
@@ -82,24 +106,44 @@ class Toolchain:
 
     @build_type.setter
     def build_type(self, value):
-        flags = self.compiler_class.build_type_flags[value]
-        self.cxx_flags.extend(flags)
-        self.c_flags.extend(flags)
+        if value != self._build_type:
+            # do not accumulate flags when build type is set several times
+            if self._build_type is not None:
+                for flag in self.compiler_class.build_type_flags[self._build_type]:
+                    for flags in self.cxx_flags, self.c_flags:
+                        if flag in flags:
+                            flags.remove(flag)
+            flags = self.compiler_class.build_type_flags[value]
+            self.cxx_flags.extend(flags)
+            self.c_flags.extend(flags)
         self._build_type = value
+        self._conan_profile = None
 
-        from cpppm import get_conan
-        from conans.client.profile_loader import profile_from_args
-        app = get_conan().app
+    @property
+    def conan_profile_args(self):
         profile_args = [f'compiler={self.compiler_id.name}',
                         f'compiler.version={self.conan_version}',
                         f'build_type={self._build_type}',
                         f'arch_build={self.arch}']
         if self.libcxx:
             profile_args.append(f'compiler.libcxx={self.libcxx}{self.libcxx_abi_version}')
-        self.conan_profile = profile_from_args(None,
-                                               profile_args,
-                                               None, self.env_list, None, app.cache)
-        self.conan_settings = self.conan_profile.settings
+        return profile_args
+
+    @property
+    def conan_profile(self):
+        # created on first use (requires the conan API)
+        if self._conan_profile is None:
+            from cpppm import get_conan
+            from conans.client.profile_loader import profile_from_args
+            app = get_conan().app
+            self._conan_profile = profile_from_args(None,
+                                                    self.conan_profile_args,
+                                                    None, self.env_list, None, app.cache)
+        return self._conan_profile
+
+    @property
+    def conan_settings(self):
+        return self.conan_profile.settings
 
     @property
     def version(self):
@@ -115,7 +159,9 @@ class Toolchain:
 
     @property
     def cxx_compiler(self):
-        return self.compiler_class(self)
+        if self._cxx_compiler is None:
+            self._cxx_compiler = self.compiler_class(self)
+        return self._cxx_compiler
 
     def __cache_save__(self):
         return self.id
@@ -158,44 +204,243 @@ def _find_compiler_tool(tool_names, cc_path, compiler_id, tools_prefix=None):
 
 class UnixToolchain(Toolchain):
 
-    def __init__(self, compiler_id, arch, cc_path, cxx_path, debugger, tools_prefix, **kwargs):
+    def __init__(self, compiler_id, arch, cc_path, cxx_path, debugger, tools_prefix, tools=None, **kwargs):
         from cpppm.build.compiler import UnixCompiler
 
-        gold = _find_compiler_tool('gold', cc_path, compiler_id, tools_prefix)
-        if gold:
+        if tools is None:
+            tools = _find_unix_tools(cc_path, compiler_id, debugger, tools_prefix)
+
+        if tools['gold']:
             if 'link_flags' not in kwargs:
                 kwargs['link_flags'] = []
             kwargs['link_flags'].append('-fuse-ld=gold')
 
         super().__init__(compiler_id.name, compiler_id, arch, cc_path, cxx_path,
                          as_=cc_path,
-                         nm=_find_compiler_tool('nm', cc_path, compiler_id, tools_prefix),
-                         ar=_find_compiler_tool('ar', cc_path, compiler_id, tools_prefix),
+                         nm=tools['nm'],
+                         ar=tools['ar'],
                          link=cxx_path,
-                         strip=_find_compiler_tool('strip', cc_path, compiler_id, tools_prefix),
-                         dbg=_find_compiler_tool(debugger, cc_path, compiler_id, tools_prefix),
+                         strip=tools['strip'],
+                         dbg=tools['dbg'],
                          compiler_class=UnixCompiler, **kwargs)
 
 
+def _find_unix_tools(cc_path, compiler_id, debugger, tools_prefix):
+    return {
+        'gold': _find_compiler_tool('gold', cc_path, compiler_id, tools_prefix),
+        'nm': _find_compiler_tool('nm', cc_path, compiler_id, tools_prefix),
+        'ar': _find_compiler_tool('ar', cc_path, compiler_id, tools_prefix),
+        'strip': _find_compiler_tool('strip', cc_path, compiler_id, tools_prefix),
+        'dbg': _find_compiler_tool(debugger, cc_path, compiler_id, tools_prefix),
+    }
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _UnixCompilersCache:
+    """Persisted unix compilers detection results
+
+    Each candidate executable detection results (compiler id, then tools once needed) are reused until $PATH,
+    one of its directories, or the executable itself is modified.
+    """
+    version = 3
+
+    def __init__(self):
+        self.path = cache.build_root / 'cpppm-unix-toolchains.cache' if cache.build_root else None
+        self._search_path = os.getenv('PATH', '')
+        self._data = None
+        self._dirty = False
+
+    def _load(self):
+        data = None
+        if self.path is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                pass
+        if data is None or data.get('version') != self.version or data.get('search_path') != self._search_path \
+                or any(_mtime(d) != mtime for d, mtime in data['dirs'].items()):
+            data = {'version': self.version,
+                    'search_path': self._search_path,
+                    'dirs': {d: _mtime(d) for d in self._search_path.split(os.pathsep) if d},
+                    'compilers': dict()}
+        self._data = data
+
+    def get(self, key, cc_path):
+        if self._data is None:
+            self._load()
+        entry = self._data['compilers'].get(key, dict()).get(str(cc_path))
+        if entry is None or _mtime(cc_path) != entry['mtime']:
+            return None
+        return entry
+
+    def set(self, key, cc_path, entry):
+        self._data['compilers'].setdefault(key, dict())[str(cc_path)] = entry
+        self._dirty = True
+
+    def save(self):
+        if self._dirty and self.path is not None:
+            dump_json(self.path, self._data)
+        self._dirty = False
+
+
+def clear_unix_toolchains_cache():
+    if cache.build_root is not None:
+        path = cache.build_root / 'cpppm-unix-toolchains.cache'
+        if path.exists():
+            path.unlink()
+
+
+def _unix_compilers_key(cc_name, cxx_name, debugger, tools_prefix):
+    return f'{cc_name}:{cxx_name}:{debugger}:{tools_prefix}'
+
+
+def _unix_compiler_candidates(cc_name):
+    """Compiler executables named cc_name or cc_name-<major> found in $PATH
+
+    Executables resolving to the same file are only listed once, under their most specific name
+    (eg.: gcc-12 rather than gcc), the first one in $PATH order.
+    """
+    expr = re.compile(rf'{re.escape(cc_name)}(-\d+)?$')
+    candidates = dict()
+    for directory in os.getenv('PATH', '').split(os.pathsep):
+        try:
+            names = sorted(entry.name for entry in os.scandir(directory or '.') if expr.match(entry.name))
+        except OSError:
+            continue
+        for name in names:
+            path = Path(directory) / name
+            if not os.access(path, os.X_OK):
+                continue
+            resolved = path.resolve()
+            known = candidates.get(resolved)
+            if known is None or (known.name == cc_name and name != cc_name):
+                candidates[resolved] = path
+    return list(candidates.values())
+
+
+def _version_candidates(candidates, cc_name, version):
+    """Split candidates into the ones to probe for version: [named after it (eg.: gcc-12), unversioned (gcc)]
+
+    Only a plain version (eg.: 12 or 12.2) names executables, other specifications need all candidates to be probed.
+    """
+    m = re.fullmatch(r'(\d+)(\.\d+)*', version)
+    if m is None:
+        return [candidates]
+    return [[path for path in candidates if path.name == f'{cc_name}-{m.group(1)}'],
+            [path for path in candidates if path.name == cc_name]]
+
+
+class _UnixCompilersDetection:
+    """Unix compilers detection, probing candidate executables only once needed (see _UnixCompilersCache)"""
+
+    def __init__(self, cc_name, cxx_name, debugger, tools_prefix):
+        self.cc_name = cc_name
+        self.cxx_name = cxx_name
+        self.debugger = debugger
+        self.tools_prefix = tools_prefix
+        self.key = _unix_compilers_key(cc_name, cxx_name, debugger, tools_prefix)
+        self.cache = _UnixCompilersCache()
+
+    def _entry(self, cc_path):
+        entry = self.cache.get(self.key, cc_path)
+        if entry is None:
+            cxx_path = cc_path.parent / cc_path.name.replace(self.cc_name, self.cxx_name)
+            entry = {'cc': str(cc_path), 'mtime': _mtime(cc_path)}
+            if cxx_path.exists():
+                compiler_id = detect_compiler_id(cc_path)
+                entry.update({
+                    'cxx': str(cxx_path),
+                    'compiler_id': [compiler_id.name, compiler_id.major, compiler_id.minor, compiler_id.patch],
+                    'tools': None,
+                })
+            else:
+                logging.warning(f'Cannot find cxx path for {self.cxx_name} (should be: "{cxx_path}")')
+                entry['cxx'] = None
+            self.cache.set(self.key, cc_path, entry)
+        return entry
+
+    def compilers(self, candidates, version=None):
+        """Identify candidates (matching version)
+
+        :return: List of (compiler_id, cc_path, cxx_path).
+        """
+        compilers = list()
+        for cc_path in candidates:
+            entry = self._entry(cc_path)
+            if entry['cxx'] is None:
+                continue
+            compiler_id = CompilerId(*entry['compiler_id'])
+            if version and not SimpleSpec(version).match(Version(compiler_id.version)):
+                continue
+            compilers.append((compiler_id, cc_path, Path(entry['cxx'])))
+        return compilers
+
+    def tools(self, compiler_id, cc_path):
+        entry = self._entry(cc_path)
+        if entry['tools'] is None:
+            tools = _find_unix_tools(cc_path, compiler_id, self.debugger, self.tools_prefix)
+            entry['tools'] = {k: str(v) if v else None for k, v in tools.items()}
+            self.cache.set(self.key, cc_path, entry)
+        return {k: Path(v) if v else None for k, v in entry['tools'].items()}
+
+    def save(self):
+        self.cache.save()
+
+
+def _make_unix_toolchain(compiler_id, arch, cc_path, cxx_path, debugger, tools_prefix, tools, **kwargs):
+    toolchain = UnixToolchain(compiler_id, arch, cc_path, cxx_path, debugger, tools_prefix, tools=tools, **kwargs)
+    if arch == 'x86_64':
+        toolchain.cxx_flags.append('-m64')
+        toolchain.c_flags.append('-m64')
+    else:
+        toolchain.cxx_flags.append('-m32')
+        toolchain.c_flags.append('-m32')
+    return toolchain
+
+
 def find_unix_toolchains(cc_name, cxx_name, debugger, archs=None, version=None, tools_prefix=None, **kwargs):
     toolchains = set()
     if archs is None:
         archs = [detect.build_arch()]
+    detection = _UnixCompilersDetection(cc_name, cxx_name, debugger, tools_prefix)
+    compilers = [(compiler_id, cc_path, cxx_path, detection.tools(compiler_id, cc_path))
+                 for compiler_id, cc_path, cxx_path in detection.compilers(_unix_compiler_candidates(cc_name), version)]
+    detection.save()
     for arch in archs:
-        for cc_path in find_executables(rf'{cc_name}($|-\d+$)', regex=True):
-            compiler_id = detect_compiler_id(cc_path)
-            if version and not SimpleSpec(version).match(Version(compiler_id.version)):
-                continue
-            cxx_path = cc_path.parent / cc_path.name.replace(cc_name, cxx_name)
-            if not cxx_path.exists():
-                logging.warning(f'Cannot find cxx path for {cxx_name} (should be: "{cxx_path}")')
-                continue
-            toolchain = UnixToolchain(compiler_id, arch, cc_path, cxx_path, debugger, tools_prefix, **kwargs)
-            if arch == 'x86_64':
-                toolchain.cxx_flags.append('-m64')
-                toolchain.c_flags.append('-m64')
-            else:
-                toolchain.cxx_flags.append('-m32')
-                toolchain.c_flags.append('-m32')
-            toolchains.add(toolchain)
+        for compiler_id, cc_path, cxx_path, tools in compilers:
+            toolchains.add(_make_unix_toolchain(compiler_id, arch, cc_path, cxx_path, debugger, tools_prefix, tools,
+                                                **kwargs))
     return toolchains
+
+
+def find_unix_toolchain(cc_name, cxx_name, debugger, arch=None, version=None, tools_prefix=None, **kwargs):
+    """Find the unix toolchain matching version and arch
+
+    Only one toolchain is constructed (the highest matching version). When a version is given, only the executables
+    named after it (eg.: gcc-12) are probed, then the unversioned ones (gcc) if none matches.
+    Detection results are persisted (and shared with find_unix_toolchains).
+    """
+    arch = arch or detect.build_arch()
+    detection = _UnixCompilersDetection(cc_name, cxx_name, debugger, tools_prefix)
+    candidates = _unix_compiler_candidates(cc_name)
+    compilers = list()
+    for group in (_version_candidates(candidates, cc_name, version) if version else [candidates]):
+        compilers = detection.compilers(group, version)
+        if compilers:
+            break
+    if not compilers:
+        detection.save()
+        return None
+    # highest version, then versioned name (eg.: gcc-12 rather than a distinct gcc 12), then $PATH order
+    compiler_id, cc_path, cxx_path = max(compilers, key=lambda compiler: (Version(compiler[0].version),
+                                                                         compiler[1].name != cc_name))
+    tools = detection.tools(compiler_id, cc_path)
+    detection.save()
+    return _make_unix_toolchain(compiler_id, arch, cc_path, cxx_path, debugger, tools_prefix, tools, **kwargs)
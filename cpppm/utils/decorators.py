@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import os
 from collections.abc import Iterable
 from functools import wraps
@@ -48,6 +49,25 @@ def working_directory(cwd: Path, env: Dict = None, create=True):
     return decorator
 
 
+# bumped each time a list_property is assigned (invalidates collected values)
+_collect_version = 0
+
+
+def invalidate_collected():
+    """Invalidate memoized collectable properties
+
+    Must be called when a collected attribute (or the attribute collection recurses on)
+    is modified without using its property setter.
+    """
+    global _collect_version
+    _collect_version += 1
+
+
+def collect_version() -> int:
+    """Current collected values version (changes each time they are invalidated)"""
+    return _collect_version
+
+
 class list_property:
     """Overrides assignments of list-like objects"""
 
@@ -58,6 +78,7 @@ class list_property:
         return self.fget(obj)
 
     def __set__(self, obj, val):
+        invalidate_collected()
         prop = self.fget(obj)
         assert type(prop) != tuple
         if isinstance(val, Iterable) and not isinstance(val, str):
@@ -93,28 +114,47 @@ class CollectError(RuntimeError):
 
 
 class collectable_property(list_property):
+    """Property collected recursively
+
+    Collected values are memoized per object until a list_property is assigned
+    (see invalidate_collected). They are collected into a copy of the object own value,
+    which is left unmodified.
+    """
 
     def __init__(self, fget, rget, permissive):
         super().__init__(fget)
         self.fget = fget
         self.rget = rget
         self.permissive = permissive
+        self._accepted_types: Dict[type, bool] = dict()
+
+    def _accepts(self, obj_type) -> bool:
+        # ensure collected object has the recursive property
+        found = self._accepted_types.get(obj_type)
+        if found is None:
+            found = False
+            for att in type_dir(obj_type).values():
+                if hasattr(att, 'rget') and att.rget == self.rget:
+                    found = True
+                    break
+            self._accepted_types[obj_type] = found
+        return found
 
     def __get__(self, obj, obj_type):
 
-        # ensure collected object has the recursive property
-        found = False
-        for att in type_dir(obj_type).values():
-            if hasattr(att, 'rget') and att.rget == self.rget:
-                found = True
-                break
-        if not found:
+        if not self._accepts(obj_type):
             if self.permissive:
                 return None
             raise CollectError(f'Collecting unexpected recursive type {obj_type!r}')
-        collected = self.fget(obj)
-        # collected = type(collected)(collected)
+        cache = obj.__dict__.setdefault('_collected', dict())
+        version, collected = cache.get(self, (None, None))
+        if version == _collect_version:
+            return collected
+        collected = copy.copy(self.fget(obj))
         subs = self.rget(obj) if callable(self.rget) else self.rget.__get__(obj, type(obj))
+        if isinstance(subs, set):
+            # stable collection order (eg.: include directories)
+            subs = sorted(subs, key=str)
         for sub in subs:
             prop = self.__get__(sub, type(sub))
             if prop is None:
@@ -124,6 +164,7 @@ class collectable_property(list_property):
             else:
                 collected.extend(prop)
 
+        cache[self] = (_collect_version, collected)
         return collected
 
     def recurse(self, rget):
@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+from typing import Dict, Union
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path, unless it already has this content (so that its modification time is kept)
+
+    :return: True if path has been written.
+    """
+    try:
+        if path.read_text() == content:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(exist_ok=True, parents=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(content)
+    tmp.replace(path)
+    stat_cache.invalidate(path)
+    return True
+
+
+_UNKNOWN = object()
+
+
+class StatCache:
+    """Files metadata cache
+
+    Directories are listed once (os.scandir), so that missing files are known without further system call,
+    and each file is stat'ed at most once (for free on Windows, where directory listing provides metadata).
+    The cache is shared by all targets (headers are usually used by many of them); written files must
+    be invalidated.
+    """
+
+    def __init__(self):
+        self._dirs: Dict[str, Dict[str, object]] = dict()
+
+    def clear(self):
+        self._dirs.clear()
+
+    def _entries(self, directory: str) -> Dict[str, object]:
+        entries = self._dirs.get(directory)
+        if entries is None:
+            entries = dict()
+            try:
+                with os.scandir(directory or '.') as it:
+                    for entry in it:
+                        entries[entry.name] = entry
+            except OSError:
+                pass
+            self._dirs[directory] = entries
+        return entries
+
+    def stat(self, path: Union[str, Path]) -> Union[os.stat_result, None]:
+        """Get path metadata (following symlinks), None if it does not exist"""
+        path = os.fspath(path)
+        directory, name = os.path.split(path)
+        entries = self._entries(directory)
+        value = entries.get(name)
+        if value is None or isinstance(value, os.stat_result):
+            return value
+        try:
+            value = os.stat(path) if value is _UNKNOWN else value.stat()
+        except OSError:
+            value = None
+        entries[name] = value
+        return value
+
+    def invalidate(self, path: Union[str, Path]):
+        """Forget path metadata (to be called when path is written)"""
+        directory, name = os.path.split(os.fspath(path))
+        entries = self._dirs.get(directory)
+        if entries is not None:
+            entries[name] = _UNKNOWN
+
+
+stat_cache = StatCache()
@@ -0,0 +1,148 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+
+from .. import _logger
+
+# priority of the jobs started from current context (highest first)
+job_priority = contextvars.ContextVar('job_priority', default=0)
+# expected peak memory (bytes) of the jobs started from current context (0: unknown)
+job_memory = contextvars.ContextVar('job_memory', default=0)
+
+
+class JobPool:
+    """Project-wide pool of job tokens
+
+    Every spawned process (compilation, archive, link...) must own a token,
+    so that the number of concurrent processes never exceeds `jobs`.
+    When jobs are queued, tokens are given by `job_priority` order.
+
+    When `memory_limit` is set, jobs are also only started while the sum of running jobs
+    expected memory (`job_memory`) stays under this limit (a job is always started when
+    nothing else runs).
+    """
+
+    def __init__(self, jobs: int = None, memory_limit: int = None):
+        self._logger = _logger.getChild('jobs')
+        self._jobs = jobs or os.cpu_count() or 1
+        self.memory_limit = memory_limit
+        self.memory = 0
+        self._condition = None
+        self._loop = None
+        self.running = 0
+        self.pending = 0
+        self._waiters = []
+        self._counter = itertools.count()
+        self.reset_stats()
+
+    @property
+    def jobs(self) -> int:
+        return self._jobs
+
+    @jobs.setter
+    def jobs(self, value: int):
+        self._jobs = max(1, int(value or os.cpu_count() or 1))
+
+    def reset_stats(self):
+        self.total = 0
+        self.max_pending = 0
+        self.max_running = 0
+        self.max_memory = 0
+        self._busy = 0.0
+        self._start = time.monotonic()
+        self._last_change = self._start
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_event_loop()
+        if self._condition is None or self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _account(self):
+        now = time.monotonic()
+        self._busy += self.running * (now - self._last_change)
+        self._last_change = now
+
+    def _fits(self, memory: int) -> bool:
+        if not self.memory_limit or not self.running:
+            return True
+        return self.memory + memory <= self.memory_limit
+
+    async def acquire(self) -> int:
+        """Wait for a job token
+
+        :return: The memory reserved for the job (to be given back to release).
+        """
+        condition = self._get_condition()
+        memory = job_memory.get()
+        async with condition:
+            entry = (-job_priority.get(), next(self._counter))
+            heapq.heappush(self._waiters, entry)
+
+            def ready():
+                return self.running < self._jobs and self._waiters[0] == entry and self._fits(memory)
+
+            try:
+                if not ready():
+                    self.pending += 1
+                    self.max_pending = max(self.max_pending, self.pending)
+                    try:
+                        await condition.wait_for(ready)
+                    finally:
+                        self.pending -= 1
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                condition.notify_all()
+                raise
+            heapq.heappop(self._waiters)
+            # let next waiter take remaining slots
+            condition.notify_all()
+            self._account()
+            self.running += 1
+            self.memory += memory
+            self.total += 1
+            self.max_running = max(self.max_running, self.running)
+            self.max_memory = max(self.max_memory, self.memory)
+        return memory
+
+    async def release(self, memory: int = 0):
+        condition = self._get_condition()
+        async with condition:
+            self._account()
+            self.running -= 1
+            self.memory -= memory
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def job(self):
+        memory = await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release(memory)
+
+    @property
+    def utilization(self) -> float:
+        """Ratio of used job tokens over elapsed time (0.0 to 1.0)"""
+        self._account()
+        elapsed = self._last_change - self._start
+        if elapsed <= 0:
+            return 0.0
+        return self._busy / (elapsed * self._jobs)
+
+    def report(self):
+        self._logger.info(f'{self.total} jobs run with {self._jobs} slots '
+                          f'(max running: {self.max_running}, max queued: {self.max_pending}, '
+                          f'utilization: {self.utilization:.0%})')
+        if self.memory_limit:
+            self._logger.info(f'max expected memory: {self.max_memory >> 20}MB '
+                              f'(limit: {self.memory_limit >> 20}MB)')
+
+
+job_pool = JobPool()
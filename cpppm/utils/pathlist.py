@@ -3,46 +3,76 @@ import re
 from pathlib import Path
 from typing import Iterable, List
 
+from .decorators import invalidate_collected
+
 
 class PathList:
-    def __init__(self, root: Path, *paths):
+    """Paths (relative to root) and generator events
+
+    Modifications invalidate collected values (see invalidate_collected), except for lists
+    not owned by any target (eg.: copies, derived values).
+    """
+
+    def __init__(self, root: Path, *paths, owned: bool = True):
         self.root = root.resolve()
         self.paths = []
         self.events = []
-        if paths:
-            self.extend(paths)
+        self._owned = owned
+        for p in paths:
+            self._add(p)
+
+    def __copy__(self) -> 'PathList':
+        other = PathList.__new__(PathList)
+        other.root = self.root
+        other.paths = list(self.paths)
+        other.events = list(self.events)
+        other._owned = False
+        return other
+
+    def _modified(self):
+        if self._owned:
+            invalidate_collected()
 
     def glob(self, pattern: str):
-        self.paths.extend(self.root.glob(pattern))
+        from ..cache.globs import glob
+        self.paths.extend(glob(self.root, pattern))
+        self._modified()
 
     def rglob(self, pattern: str):
-        self.paths.extend(self.root.rglob(pattern))
+        from ..cache.globs import glob
+        self.paths.extend(glob(self.root, f'**/{pattern}'))
+        self._modified()
 
     def rfilter(self, pattern: str):
         pattern = fnmatch.translate(pattern)
         for path in self:
             if re.match(pattern, str(path)):
                 self.paths.remove(path)
+        self._modified()
 
-    def append(self, obj) -> None:
+    def _add(self, obj) -> bool:
         if isinstance(obj, (str, Path)):
             if obj in self.paths:
-                return
+                return False
             self.paths.append(Path(obj))
         elif hasattr(obj, 'event'):
             if obj in self.events:
-                return
+                return False
             self.events.append(obj)
         else:
             assert False
+        return True
+
+    def append(self, obj) -> None:
+        if self._add(obj):
+            self._modified()
 
     def extend(self, paths: Iterable[Path]):
         if isinstance(paths, PathList):
-            for p in paths:
-                self.append(paths.root / p)
-        else:
-            for p in paths:
-                self.append(p)
+            paths = [paths.root / p for p in paths]
+        added = [self._add(p) for p in paths]
+        if any(added):
+            self._modified()
 
     def absolute(self) -> List[Path]:
         return [self.root / path.as_posix() for path in self]
@@ -55,9 +85,11 @@ class PathList:
 
     def __setitem__(self, index, path: Path):
         self.paths.__setitem__(index, self.__adjust__(path))
+        self._modified()
 
     def __delitem__(self, index):
         self.paths.__delitem__(index)
+        self._modified()
 
     def __iter__(self) -> Iterable[Path]:
         return self.paths.__iter__()
@@ -1,10 +1,16 @@
 import asyncio
 import os
+import signal
+import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Union
 
 from .decorators import working_directory
+from .jobs import job_pool
+from .trace import tracer
 from .. import _get_logger
 
 
@@ -12,17 +18,166 @@ class ProcessError(RuntimeError):
     pass
 
 
+class ProcessResult(tuple):
+    """(returncode, stdout, stderr) of a process, along with its wall time and resources usage"""
+
+    def __new__(cls, returncode, out, err, pid=None, wall_time=None, usage=None, timed_out=False):
+        result = super().__new__(cls, (returncode, out, err))
+        result.pid = pid
+        result.wall_time = wall_time
+        result.usage = usage
+        result.timed_out = timed_out
+        return result
+
+    @property
+    def max_rss(self) -> Union[int, None]:
+        """Peak resident set size in bytes (None if unknown)"""
+        if self.usage is None:
+            return None
+        # kilobytes on Linux, bytes on macOS
+        return self.usage.ru_maxrss if sys.platform == 'darwin' else self.usage.ru_maxrss * 1024
+
+
+def _exit_code(status: int) -> int:
+    """Decode a wait status as a return code (negative signal number if killed by a signal)"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    return status
+
+
+class _Cancellation:
+    """Kills a process waited in a thread, once the task awaiting it is cancelled"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kill = None
+        self.cancelled = False
+
+    def attach(self, kill):
+        with self._lock:
+            self._kill = kill
+            if self.cancelled:
+                kill()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self._kill is not None:
+                self._kill()
+
+
+def _wait_process(args, stdout, cwd=None, env=None, timeout=None, cancellation: _Cancellation = None) -> ProcessResult:
+    """Run process, collecting its resources usage (blocking, POSIX only)
+
+    On timeout, the process and its children are killed.
+    """
+    start = time.monotonic()
+    proc = subprocess.Popen(args, stdout=stdout, stderr=subprocess.PIPE, cwd=cwd, env=env,
+                            start_new_session=timeout is not None)
+    timed_out = []
+
+    def kill():
+        try:
+            if timeout is not None:
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except OSError:
+            pass
+
+    def expire():
+        timed_out.append(True)
+        kill()
+
+    if cancellation is not None:
+        cancellation.attach(kill)
+    timer = threading.Timer(timeout, expire) if timeout is not None else None
+    if timer:
+        timer.start()
+    err = []
+    reader = threading.Thread(target=lambda: err.append(proc.stderr.read()))
+    reader.start()
+    out = proc.stdout.read() if proc.stdout else None
+    reader.join()
+    proc.stderr.close()
+    if proc.stdout:
+        proc.stdout.close()
+    _, status, usage = os.wait4(proc.pid, 0)
+    if timer:
+        timer.cancel()
+    proc.returncode = _exit_code(status)
+    return ProcessResult(proc.returncode, out, err[0], proc.pid, time.monotonic() - start, usage,
+                         timed_out=bool(timed_out))
+
+
+def _in_thread(func, *args) -> asyncio.Future:
+    loop = asyncio.get_event_loop()
+    future = loop.create_future()
+
+    def set_result(result, error):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target():
+        try:
+            result = func(*args)
+        except BaseException as error:
+            loop.call_soon_threadsafe(set_result, None, error)
+        else:
+            loop.call_soon_threadsafe(set_result, result, None)
+
+    threading.Thread(target=target, daemon=True).start()
+    return future
+
+
+async def _run_process(args, stdout, cwd=None, env=None, timeout=None) -> ProcessResult:
+    if hasattr(os, 'wait4'):
+        # asyncio reaps its children itself, losing their resources usage
+        cancellation = _Cancellation()
+        try:
+            return await _in_thread(_wait_process, args, stdout, cwd, env, timeout, cancellation)
+        except asyncio.CancelledError:
+            cancellation.cancel()
+            raise
+    start = time.monotonic()
+    proc = await asyncio.create_subprocess_exec(*args, stderr=asyncio.subprocess.PIPE, stdout=stdout,
+                                                cwd=cwd, env=env)
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        out, err = await proc.communicate()
+        return ProcessResult(proc.returncode, out, err, proc.pid, time.monotonic() - start, timed_out=True)
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    return ProcessResult(proc.returncode, out, err, proc.pid, time.monotonic() - start)
+
+
 class Runner:
-    def __init__(self, executable, cwd: Path = None, env=None, recorder=None, args=None):
+    def __init__(self, executable, cwd: Path = None, env=None, recorder=None, args=None, pool=job_pool):
         self._logger = _get_logger(self, executable)
         self.executable = str(executable.absolute().as_posix()) if isinstance(executable, Path) else executable
         self.cwd = cwd
         self.env = env
         self.recorder = recorder
         self.args = args or set()
+        self.pool = pool
 
     async def run(self, *args, cwd: Union[str, Path] = None, env: Dict = None, dry_run=False, recorder=None,
-                  stdout=None, always_return=False):
+                  stdout=None, always_return=False, timeout: float = None):
+        """Run the executable with given arguments (holding a job token)
+
+        :param stdout: Process output destination (eg.: subprocess.PIPE to capture it), inherited by default.
+        :param always_return: Return the result even on failure (instead of raising ProcessError).
+        :param timeout: Seconds after which the process is killed (the result is then flagged as `timed_out`).
+        """
         if not cwd:
             cwd = self.cwd or Path.cwd()
         if not env:
@@ -39,18 +194,19 @@ class Runner:
             if recorder:
                 recorder(cmd)
             if not dry_run:
-                proc = await asyncio.create_subprocess_exec(
-                    self.executable,
-                    *self.args, *args,
-                    stderr=asyncio.subprocess.PIPE,
-                    stdout=stdout)
-                out, err = await proc.communicate()
-
-                rc = proc.returncode
+                async with self.pool.job():
+                    with tracer.span(Path(self.executable).name, 'process', group='processes', cmd=cmd) as span:
+                        # explicitly given, the working directory and environment being shared by concurrent jobs
+                        result = await _run_process([self.executable, *self.args, *args], stdout, cwd=str(cwd),
+                                                    env={**os.environ, **env} if env else None, timeout=timeout)
+                        span['pid'] = result.pid
+                        span['returncode'] = result[0]
+
+                rc, out, err = result
                 if not always_return and rc:
                     raise ProcessError(err.decode(os.device_encoding(sys.stderr.fileno()) or 'utf-8'))
-                return rc, out, err
+                return result
             else:
-                return 0, None, None
+                return ProcessResult(0, None, None)
 
         return await do_run()
@@ -1,6 +1,8 @@
+import hashlib
 import os
 import time
 from pathlib import Path
+from typing import Iterable, Union
 
 
 def check_event_sha(old_sha1, sha1_path):
@@ -31,3 +33,38 @@ def check_generator_sha(old_sha1, sha1_path, files):
         return True
     else:
         return False
+
+
+_file_digests = dict()
+
+
+def file_sha1(path, stat=None):
+    """Get file content sha1 (memoized on path, mtime and size)"""
+    path = str(path)
+    if stat is None:
+        stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _file_digests.get(key)
+    if digest is None:
+        sha = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                sha.update(chunk)
+        digest = _file_digests[key] = sha.hexdigest()
+    return digest
+
+
+def prune_file_digests(paths: Iterable[Union[str, Path]]):
+    """Only keep the memoized digests of given paths (of their latest modification)
+
+    For long running processes (eg.: watch), whose memoized digests would otherwise keep growing.
+    """
+    paths = {str(path) for path in paths}
+    latest = dict()
+    for key in _file_digests:
+        path, mtime, _size = key
+        if path in paths and (path not in latest or mtime > latest[path][1]):
+            latest[path] = key
+    kept = {key: _file_digests[key] for key in latest.values()}
+    _file_digests.clear()
+    _file_digests.update(kept)
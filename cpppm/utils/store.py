@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Union
+
+
+def dump_json(path: Path, data, **kwargs):
+    """Write data as JSON to path atomically (readers see either the previous or the new content)"""
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, **kwargs)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+class JsonStore:
+    """Entries persisted in a versioned JSON file
+
+    The whole file is loaded once, its entries being discarded if written by another `version`
+    (or unreadable). They are written back atomically by `save`, only if modified (`_dirty`).
+    Without path, entries are kept in memory only.
+    """
+    version = 1
+
+    def __init__(self, path: Union[Path, None]):
+        self.path = path
+        self._entries: Dict[str, object] = dict()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == self.version:
+            self._entries = data['entries']
+
+    def save(self):
+        if not self._dirty or self.path is None:
+            return
+        dump_json(self.path, {'version': self.version, 'entries': self._entries}, separators=(',', ':'))
+        self._dirty = False
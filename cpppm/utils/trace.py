@@ -0,0 +1,84 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Union
+
+from .. import _logger
+
+
+class Tracer:
+    """Build events recorder
+
+    Recorded spans are written in Chrome trace event format (to be loaded in chrome://tracing or Perfetto).
+    Spans are grouped (eg.: scheduled actions, spawned processes), each group being shown as a process
+    whose threads are lanes of concurrently running spans.
+    """
+
+    def __init__(self):
+        self._logger = _logger.getChild('trace')
+        self.enabled = False
+        self.events: List[Dict] = list()
+        self._groups: Dict[str, int] = dict()
+        self._lanes: Dict[str, List[bool]] = dict()
+        self._origin = time.perf_counter()
+
+    def start(self):
+        self.enabled = True
+        self.events = list()
+        self._origin = time.perf_counter()
+
+    def stop(self):
+        self.enabled = False
+
+    def _timestamp(self) -> float:
+        # microseconds since tracing start
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _acquire_lane(self, group: str) -> int:
+        lanes = self._lanes.setdefault(group, [])
+        for index, busy in enumerate(lanes):
+            if not busy:
+                lanes[index] = True
+                return index
+        lanes.append(True)
+        return len(lanes) - 1
+
+    def _release_lane(self, group: str, lane: int):
+        self._lanes[group][lane] = False
+
+    @contextmanager
+    def span(self, name: str, category: str, group: str = 'actions', **args):
+        """Record the enclosed block duration
+
+        :return: The span arguments (can be completed in the block).
+        """
+        if not self.enabled:
+            yield args
+            return
+        pid = self._groups.setdefault(group, len(self._groups) + 1)
+        lane = self._acquire_lane(group)
+        start = self._timestamp()
+        try:
+            yield args
+        except BaseException as err:
+            args['error'] = repr(err)
+            raise
+        finally:
+            self._release_lane(group, lane)
+            self.events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': start,
+                                'dur': self._timestamp() - start, 'pid': pid, 'tid': lane,
+                                'args': {k: str(v) for k, v in args.items()}})
+
+    def save(self, path: Union[str, Path]):
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': group}}
+                  for group, pid in self._groups.items()]
+        events.extend(self.events)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'pid': os.getpid()}}, f)
+        self._logger.info(f'{len(self.events)} events written to {path}')
+
+
+tracer = Tracer()
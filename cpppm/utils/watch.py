@@ -0,0 +1,185 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Set, Union
+
+from .. import _logger
+
+_logger = _logger.getChild('watch')
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+_event = struct.Struct('iIII')
+
+
+def _libc():
+    if not hasattr(os, 'O_NONBLOCK'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class Watcher:
+    """Files modification watcher
+
+    Watches a set of files (build inputs) and reports the ones that have been modified, created or removed.
+
+    :param files: The files to watch.
+    """
+
+    def __init__(self, files: Iterable[Union[str, Path]]):
+        self.files: Set[str] = set()
+        self._changed: Set[str] = set()
+        self._event = asyncio.Event()
+        self.update(files)
+
+    def update(self, files: Iterable[Union[str, Path]]):
+        """Replace the watched files set"""
+        self.files = {os.fspath(f) for f in files}
+
+    def _notify(self, path: str):
+        if path in self.files:
+            self._changed.add(path)
+            self._event.set()
+
+    async def changes(self, debounce: float = 0.1) -> Set[Path]:
+        """Wait for watched files changes
+
+        Once a change is seen, further changes are collected until none happens for `debounce` seconds
+        (eg.: an editor saving several files, a checkout).
+        """
+        while not self._changed:
+            self._event.clear()
+            await self._event.wait()
+        while True:
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), debounce)
+            except asyncio.TimeoutError:
+                break
+        changed, self._changed = self._changed, set()
+        return {Path(p) for p in changed}
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class InotifyWatcher(Watcher):
+    """Linux inotify based watcher (parent directories of the watched files are watched)"""
+    mask = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+    def __init__(self, files: Iterable[Union[str, Path]], libc=None):
+        self._libc = libc or _libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._watches: Dict[int, str] = dict()
+        super().__init__(files)
+        asyncio.get_event_loop().add_reader(self._fd, self._read)
+
+    def update(self, files: Iterable[Union[str, Path]]):
+        super().update(files)
+        directories = {os.path.dirname(f) for f in self.files}
+        for wd, directory in list(self._watches.items()):
+            if directory not in directories:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        watched = set(self._watches.values())
+        for directory in directories - watched:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.mask)
+            if wd < 0:
+                _logger.warning(f'cannot watch {directory}: {os.strerror(ctypes.get_errno())}')
+                continue
+            self._watches[wd] = directory
+
+    def _read(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _event.unpack_from(data, offset)
+            offset += _event.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                # directory removed
+                del self._watches[wd]
+                continue
+            self._notify(os.path.join(directory, os.fsdecode(name)))
+
+    def close(self):
+        if self._fd >= 0:
+            asyncio.get_event_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(Watcher):
+    """Portable watcher, polling watched files metadata every `interval` seconds"""
+
+    def __init__(self, files: Iterable[Union[str, Path]], interval: float = 0.5):
+        self.interval = interval
+        self._states: Dict[str, tuple] = dict()
+        super().__init__(files)
+        self._task = asyncio.ensure_future(self._poll())
+
+    @staticmethod
+    def _state(path: str):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def update(self, files: Iterable[Union[str, Path]]):
+        super().update(files)
+        self._states = {f: self._states[f] if f in self._states else self._state(f) for f in self.files}
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            for path, state in self._states.items():
+                current = self._state(path)
+                if current != state:
+                    self._states[path] = current
+                    self._notify(path)
+
+    def close(self):
+        self._task.cancel()
+
+
+def get_watcher(files: Iterable[Union[str, Path]]) -> Watcher:
+    """Get the best available watcher (inotify, else polling)"""
+    libc = _libc()
+    if libc is not None:
+        try:
+            return InotifyWatcher(files, libc)
+        except OSError as err:
+            _logger.warning(f'inotify unavailable ({err}), falling back to polling')
+    return PollingWatcher(files)
@@ -0,0 +1,40 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from cpppm.build.compdb import export_compile_commands
+
+
+class FakeCompiler:
+    def __init__(self):
+        self.flags = ['-O2']
+
+    def compile_commands(self, target):
+        return [{'file': str(source), 'arguments': ['c++', *self.flags, str(source)]} for source in target.sources]
+
+
+class CompileCommandsTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def test_export(self):
+        output = self.root / 'build' / 'compile_commands.json'
+        targets = [SimpleNamespace(name='b', sources=['b.cpp'], build_path=self.root / 'build' / 'b'),
+                   SimpleNamespace(name='a', sources=['a.cpp'], build_path=self.root / 'build' / 'a'),
+                   SimpleNamespace(name='h', sources=[], build_path=self.root / 'build' / 'h')]
+        compiler = FakeCompiler()
+        self.assertTrue(export_compile_commands(output, targets, compiler))
+        self.assertEqual([entry['file'] for entry in json.loads(output.read_text())], ['a.cpp', 'b.cpp'])
+        # unchanged commands: not rewritten
+        self.assertFalse(export_compile_commands(output, targets, compiler))
+        compiler.flags.append('-g')
+        self.assertTrue(export_compile_commands(output, targets, compiler))
+        self.assertEqual(sorted(p.name for p in (self.root / 'build').iterdir()), ['compile_commands.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
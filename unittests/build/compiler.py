@@ -0,0 +1,145 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from cpppm.build.compiler import Compiler, UnixCompiler
+from cpppm.utils.sha import file_sha1
+
+
+class DepfileTestCase(unittest.TestCase):
+
+    def test_parse_depfile(self):
+        content = '/build/main.o: /src/main.cpp /src/main.hpp \\\n' \
+                  ' /src/with\\ space.hpp \\\n' \
+                  ' /include/lib.hpp\n'
+        self.assertEqual(UnixCompiler.parse_depfile(content),
+                         ['/src/main.cpp', '/src/main.hpp', '/src/with space.hpp', '/include/lib.hpp'])
+
+
+class ObjectCommandTestCase(unittest.TestCase):
+
+    def test_toolchain_flags_unchanged(self):
+        compiler = UnixCompiler.__new__(UnixCompiler)
+        compiler.toolchain = SimpleNamespace(cxx_flags=['-O3'])
+        first = compiler.object_command(Path('/src/a.cpp'), Path('/build'), ['-Iinclude'], pic=True)
+        second = compiler.object_command(Path('/src/a.cpp'), Path('/build'), ['-Iinclude'], pic=True)
+        self.assertEqual(first, second)
+        self.assertEqual(compiler.toolchain.cxx_flags, ['-O3'])
+        self.assertEqual(first[:3], ['-O3', '-fPIC', '-Iinclude'])
+        self.assertEqual(first[-4:], ['-c', '/src/a.cpp', '-o', '/build/a.o'])
+
+    def test_pch_header_dry_run(self):
+        compiler = UnixCompiler.__new__(UnixCompiler)
+        with tempfile.TemporaryDirectory(prefix='cpppm-tests-') as root:
+            target = SimpleNamespace(name='target', precompiled_headers=['<vector>'], source_path=Path(root),
+                                     build_path=Path(root) / 'build')
+            with mock.patch.object(Compiler, 'dry_run', True):
+                header = compiler.pch_header(target)
+            self.assertEqual(header, Path(root) / 'build' / 'pch' / 'target.hpp')
+            self.assertFalse(header.exists())
+            self.assertEqual(compiler.pch_header(target).read_text(), '#include <vector>\n')
+
+    def test_pch(self):
+        compiler = UnixCompiler.__new__(UnixCompiler)
+        header = Path('/build/pch/target.hpp')
+        compiler.toolchain = SimpleNamespace(name='gcc')
+        self.assertEqual(compiler.pch_path(header), Path('/build/pch/target.hpp.gch'))
+        self.assertEqual(compiler.pch_use_flags(header, compiler.pch_path(header)),
+                         ('-include', '/build/pch/target.hpp', '-Winvalid-pch'))
+        compiler.toolchain = SimpleNamespace(name='clang')
+        self.assertEqual(compiler.pch_use_flags(header, compiler.pch_path(header)),
+                         ('-include-pch', '/build/pch/target.hpp.pch'))
+        self.assertEqual(compiler.pch_command(header, compiler.pch_path(header), ('-O3',)),
+                         ['-O3', '-x', 'c++-header', '/build/pch/target.hpp',
+                          '-MMD', '-MF', '/build/pch/target.hpp.d', '-o', '/build/pch/target.hpp.pch'])
+
+
+_PROJECT = """from cpppm import Project, main
+project = Project('seed')
+lib = project.library('lib')
+lib.sources = 'src/lib.cpp'
+lib.compile_options = '-Wall', '-Wextra', '-O1', '-g', '-fno-rtti', '-fno-exceptions'
+lib.compile_definitions = {'A': 1, 'B': None, 'C': 'c', 'D': 2}
+if __name__ == '__main__':
+    main()
+"""
+
+
+@unittest.skipIf(shutil.which('g++') is None, 'no C++ compiler')
+class IncrementalBuildTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def build(self, seed):
+        env = dict(os.environ, PYTHONHASHSEED=str(seed),
+                   PYTHONPATH=os.pathsep.join([str(Path(__file__).parents[2]), os.environ.get('PYTHONPATH', '')]))
+        return subprocess.run([sys.executable, 'project.py', 'build'], cwd=self.root, env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=True).stdout
+
+    def test_hash_seed(self):
+        (self.root / 'src').mkdir()
+        (self.root / 'src' / 'lib.cpp').write_text('int f() { return 1; }\n')
+        (self.root / 'project.py').write_text(_PROJECT)
+        self.assertIn('1 object(s) compiled', self.build(1))
+        # sets iteration order depends on the hash seed, commands must not
+        for seed in 2, 3, 4:
+            self.assertIn('0 object(s) compiled', self.build(seed))
+
+
+_PLAN_PROJECT = """from cpppm import Project, main
+project = Project('plan')
+exe = project.main_executable()
+exe.sources = 'src/main.cpp', 'src/f1.cpp', 'src/f2.cpp', 'src/f3.cpp'
+exe.unity_build = True
+exe.unity_batch_size = {batch_size}
+exe.unity_exclude = 'src/main.cpp'
+exe.precompiled_headers = '{pch}'
+if __name__ == '__main__':
+    main()
+"""
+
+
+@unittest.skipIf(shutil.which('g++') is None, 'no C++ compiler')
+class PlanTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def run_python(self, *args):
+        env = dict(os.environ,
+                   PYTHONPATH=os.pathsep.join([str(Path(__file__).parents[2]), os.environ.get('PYTHONPATH', '')]))
+        return subprocess.run([sys.executable, *args], cwd=self.root, env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=True).stdout
+
+    def snapshot(self):
+        return {path: file_sha1(path) for path in (self.root / 'build').rglob('*') if path.is_file()}
+
+    def test_no_side_effects(self):
+        (self.root / 'src').mkdir()
+        (self.root / 'src' / 'main.cpp').write_text('int main() { return 0; }\n')
+        for name in 'f1', 'f2', 'f3':
+            (self.root / 'src' / f'{name}.cpp').write_text(f'int {name}() {{ return 1; }}\n')
+        (self.root / 'src' / 'pch.hpp').write_text('#include <vector>\n')
+        (self.root / 'src' / 'pch2.hpp').write_text('#include <map>\n')
+        (self.root / 'project.py').write_text(_PLAN_PROJECT.format(batch_size=2, pch='src/pch.hpp'))
+        self.run_python('project.py', 'build')
+        before = self.snapshot()
+
+        # outdated unity batches and precompiled header
+        (self.root / 'project.py').write_text(_PLAN_PROJECT.format(batch_size=1, pch='src/pch2.hpp'))
+        out = self.run_python('-c', 'import project; print(len(project.project.plan()))')
+        self.assertGreater(int(out.splitlines()[-1]), 0)
+        self.assertEqual(self.snapshot(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.build.depdb import DependencyDatabase
+from cpppm.utils.files import stat_cache
+
+
+class DependencyDatabaseTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+        self.source = self.root / 'main.cpp'
+        self.header = self.root / 'main.hpp'
+        self.output = self.root / 'main.o'
+        for path in self.source, self.header, self.output:
+            path.write_text(path.name)
+
+    def test_nominal(self):
+        db = DependencyDatabase(self.root / 'deps' / 'test.json')
+        self.assertEqual(db.check(self.output), 'no dependency record')
+        db.record(self.output, [self.source, self.header])
+        self.assertIsNone(db.check(self.output))
+        db.save()
+
+        db = DependencyDatabase(self.root / 'deps' / 'test.json')
+        self.assertIsNone(db.check(self.output))
+        self.assertEqual(set(db.inputs(self.output)), {self.source, self.header})
+        st = self.header.stat()
+        os.utime(self.header, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+        # files metadata are cached for a build
+        stat_cache.clear()
+        # touched but same content
+        self.assertIsNone(db.check(self.output))
+        self.header.write_text('changed')
+        stat_cache.clear()
+        self.assertEqual(db.check(self.output), f'{self.header} changed')
+
+    def age(self, *paths):
+        for path in paths:
+            t = path.stat().st_mtime - 100
+            os.utime(path, (t, t))
+
+    def test_snapshot(self):
+        db = DependencyDatabase(self.root / 'deps' / 'test.json')
+        self.age(self.source, self.header)
+        snapshot = db.snapshot(self.output, [self.source])
+        # discovered input, not modified since the action started
+        db.record(self.output, [self.source, self.header], snapshot=snapshot)
+        stat_cache.clear()
+        self.assertIsNone(db.check(self.output))
+
+        # source modified while building
+        snapshot = db.snapshot(self.output, [self.source])
+        self.source.write_text('modified while compiling')
+        db.record(self.output, [self.source, self.header], snapshot=snapshot)
+        stat_cache.clear()
+        self.assertEqual(db.check(self.output), f'{self.source} changed')
+
+        # discovered input modified while building (recorded header is known beforehand)
+        self.age(self.source)
+        other = self.root / 'other.hpp'
+        snapshot = db.snapshot(self.output, [self.source])
+        other.write_text('modified while compiling')
+        db.record(self.output, [self.source, self.header, other], snapshot=snapshot)
+        stat_cache.clear()
+        self.assertEqual(db.check(self.output), f'{other} changed')
+
+    def test_missing_output(self):
+        db = DependencyDatabase(self.root / 'deps' / 'test.json')
+        db.record(self.output, [self.source])
+        self.output.unlink()
+        self.assertEqual(db.check(self.output), 'output missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
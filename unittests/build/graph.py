@@ -0,0 +1,155 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from cpppm import Executable, Library
+from cpppm.build import graph as graph_module
+from cpppm.build.actions import Action
+from cpppm.build.graph import BuildGraph
+from cpppm.build.stats import BuildStatistics
+from cpppm.project import Project
+
+
+class FakePlanMixin:
+    """Real target, planning fake compile and link actions (logging their run)"""
+
+    def setup_fake(self, sources, log, durations=None):
+        self.fake_sources = sources
+        self.log = log
+        self.durations = durations or {}
+        return self
+
+    def plan(self, force=False, rebuilt=()):
+        def step(name):
+            async def run():
+                self.log.append(name)
+                await asyncio.sleep(0)
+            return run
+
+        actions = [Action('compile', self, Path(f'{source}.o'), 'output missing', step(source),
+                          duration=self.durations.get(source))
+                   for source in self.fake_sources]
+        actions.append(Action('link', self, Path(self.name), 'output missing', step(self.name)))
+        return actions
+
+
+class FakeLibrary(FakePlanMixin, Library):
+    pass
+
+
+class FakeExecutable(FakePlanMixin, Executable):
+    pass
+
+
+class BuildGraphTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def make(self, cls, name, sources, log, durations=None):
+        project = SimpleNamespace(bin_path=self.root / 'bin', lib_path=self.root / 'lib')
+        with mock.patch.object(Project, 'current_project', project):
+            return cls(name, self.root, self.root / 'build').setup_fake(sources, log, durations)
+
+    def test_link_after_compiles(self):
+        log = []
+        target = self.make(FakeExecutable, 'exe', ['a', 'b', 'c'], log)
+        graph = BuildGraph([target])
+        link = graph.actions[-1]
+        self.assertEqual(set(link.depends), set(graph.actions[:-1]))
+        self.assertEqual([a.priority for a in graph.actions], [2.0, 2.0, 2.0, 1.0])
+        self.assertEqual(len(graph.critical_path), 2)
+
+        self.assertTrue(asyncio.get_event_loop().run_until_complete(graph.run()))
+        self.assertEqual(log[-1], 'exe')
+        self.assertEqual(set(log[:-1]), {'a', 'b', 'c'})
+        self.assertTrue(target._built)
+
+    def test_cross_targets(self):
+        log = []
+        base = self.make(FakeLibrary, 'base', ['base_a'], log)
+        lib = self.make(FakeLibrary, 'lib', ['lib_a'], log)
+        lib.link_libraries = base
+        exe = self.make(FakeExecutable, 'exe', ['main'], log)
+        exe.link_libraries = lib
+        graph = BuildGraph([exe])
+        self.assertEqual(graph.targets, [base, lib, exe])
+        self.assertEqual(BuildGraph._order([exe, lib]), [base, lib, exe])
+
+        actions = {a.target.name if a.kind == 'link' else a.name: a for a in graph.actions}
+        links = {name: actions[name] for name in ('base', 'lib', 'exe')}
+        # links wait for the libraries links (recursively), compilations do not
+        self.assertEqual(set(links['exe'].depends), {actions['main.o'], links['lib'], links['base']})
+        self.assertEqual(set(links['lib'].depends), {actions['lib_a.o'], links['base']})
+        for name in 'base_a.o', 'lib_a.o', 'main.o':
+            self.assertEqual(actions[name].depends, [])
+        # critical path: compiling base, then the three links
+        self.assertEqual([a.priority for a in graph.critical_path], [4.0, 3.0, 2.0, 1.0])
+
+        asyncio.get_event_loop().run_until_complete(graph.run())
+        self.assertLess(log.index('base'), log.index('lib'))
+        self.assertLess(log.index('lib'), log.index('exe'))
+        self.assertTrue(all(t._built for t in (base, lib, exe)))
+
+    def test_recorded_durations(self):
+        log = []
+        lib = self.make(FakeLibrary, 'lib', ['lib_a'], log)
+        exe = self.make(FakeExecutable, 'exe', ['main', 'long'], log, durations={'long': 30.0, 'main': 0.5})
+        exe.link_libraries = lib
+        graph = BuildGraph([exe])
+        priorities = {a.name: a.priority for a in graph.actions}
+        # unknown durations count for 1 second
+        self.assertEqual(priorities, {'lib_a.o': 3.0, 'lib': 2.0, 'main.o': 1.5, 'long.o': 31.0, 'exe': 1.0})
+        self.assertEqual([a.name for a in graph.critical_path], ['long.o', 'exe'])
+
+    def test_closure_computed_once(self):
+        log = []
+        libs = [self.make(FakeLibrary, f'lib{i}', [f'lib{i}_a', f'lib{i}_b'], log) for i in range(4)]
+        for lib, dep in zip(libs[1:], libs):
+            lib.link_libraries = dep
+        exe = self.make(FakeExecutable, 'exe', ['main'], log)
+        exe.link_libraries = libs[-1]
+        with mock.patch.object(graph_module, '_lib_closure', wraps=graph_module._lib_closure) as closure:
+            BuildGraph([exe])
+        self.assertEqual(closure.call_count, 5)
+
+    def test_statistics_saved(self):
+        log = []
+        target = self.make(FakeExecutable, 'exe', ['a', 'b'], log)
+        graph = BuildGraph([target])
+        statistics = BuildStatistics(self.root / 'stats.json')
+
+        async def compile_a():
+            statistics.record(Path('a.o'), Path('a'), 2.0)
+
+        async def fail():
+            raise RuntimeError('compile failed')
+
+        graph.actions[0].func, graph.actions[0].statistics = compile_a, statistics
+        graph.actions[1].func, graph.actions[1].statistics = fail, statistics
+        with self.assertRaises(RuntimeError):
+            asyncio.get_event_loop().run_until_complete(graph.run())
+        # whatever the build entry point (and outcome)
+        self.assertEqual(BuildStatistics(statistics.path).last('a.o', 'wall'), 2.0)
+
+    def test_failure(self):
+        log = []
+        target = self.make(FakeExecutable, 'exe', ['a'], log)
+        graph = BuildGraph([target])
+
+        async def fail():
+            raise RuntimeError('compile failed')
+
+        graph.actions[0].func = fail
+        with self.assertRaises(RuntimeError):
+            asyncio.get_event_loop().run_until_complete(graph.run())
+        self.assertEqual(log, [])
+        self.assertFalse(target._built)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.build.stats import BuildStatistics
+
+
+class BuildStatisticsTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.path = Path(self.tempdir.name) / 'stats.json'
+
+    def test_history(self):
+        stats = BuildStatistics(self.path)
+        for wall in 1.0, 3.0, 4.0:
+            stats.record(Path('/build/a.o'), Path('/src/a.cpp'), wall, 100 << 20, 1024)
+        stats.record(Path('/build/b.o'), Path('/src/b.cpp'), 2.0, 200 << 20)
+        stats.save()
+
+        stats = BuildStatistics(self.path)
+        self.assertEqual(stats.last('/build/a.o', 'wall'), 4.0)
+        self.assertEqual(stats.trend('/build/a.o', 'wall'), 1.0)
+        self.assertIsNone(stats.trend('/build/b.o', 'wall'))
+        self.assertEqual([row['source'] for row in stats.top('wall')], ['/src/a.cpp', '/src/b.cpp'])
+        self.assertEqual([row['source'] for row in stats.top('rss', 1)], ['/src/b.cpp'])
+        self.assertEqual([row['source'] for row in stats.top('size')], ['/src/a.cpp'])
+
+    def test_history_size(self):
+        stats = BuildStatistics(self.path)
+        for wall in range(BuildStatistics.history_size + 5):
+            stats.record(Path('/build/a.o'), Path('/src/a.cpp'), float(wall))
+        self.assertEqual(len(stats.history('/build/a.o')), BuildStatistics.history_size)
+        self.assertEqual(stats.last('/build/a.o', 'wall'), BuildStatistics.history_size + 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
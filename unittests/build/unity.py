@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from cpppm.build.unity import unity_sources
+from cpppm.utils.pathlist import PathList
+
+
+class UnitySourcesTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+        names = ['main.cpp', 'a.cpp', 'b.cpp', 'c.cpp', 'd.c']
+        for name in names:
+            (self.root / name).write_text('')
+        self.target = SimpleNamespace(name='test', build_path=self.root / 'build',
+                                      compile_sources=PathList(self.root, *names),
+                                      unity_exclude=PathList(self.root, 'main.cpp'),
+                                      unity_build=True, unity_batch_size=2)
+
+    def test_disabled(self):
+        self.target.unity_build = False
+        self.assertEqual(unity_sources(self.target), self.target.compile_sources.absolute())
+
+    def test_batches(self):
+        sources = unity_sources(self.target)
+        unity_path = self.root / 'build' / 'unity' / 'test'
+        # excluded first, C and C++ sources are not merged together, single source batch is not generated
+        self.assertEqual(sources, [self.root / 'main.cpp', self.root / 'd.c',
+                                   unity_path / 'test-unity-cpp-0.cpp', self.root / 'c.cpp'])
+        self.assertEqual((unity_path / 'test-unity-cpp-0.cpp').read_text(),
+                         f'#include "{(self.root / "a.cpp").as_posix()}"\n'
+                         f'#include "{(self.root / "b.cpp").as_posix()}"\n')
+
+        # outdated batches are removed
+        self.target.unity_batch_size = 4
+        sources = unity_sources(self.target)
+        self.assertEqual(sources, [self.root / 'main.cpp', self.root / 'd.c', unity_path / 'test-unity-cpp-0.cpp'])
+        self.assertEqual(list(unity_path.iterdir()), [unity_path / 'test-unity-cpp-0.cpp'])
+
+    def test_no_write(self):
+        sources = unity_sources(self.target, write=False)
+        self.assertIn(self.root / 'build' / 'unity' / 'test' / 'test-unity-cpp-0.cpp', sources)
+        self.assertFalse((self.root / 'build').exists())
+
+    def test_mixed_languages(self):
+        (self.root / 'e.c').write_text('')
+        self.target.compile_sources = PathList(self.root, 'a.cpp', 'b.cpp', 'd.c', 'e.c')
+        sources = unity_sources(self.target)
+        unity_path = self.root / 'build' / 'unity' / 'test'
+        self.assertEqual(sources, [unity_path / 'test-unity-c-0.c', unity_path / 'test-unity-cpp-0.cpp'])
+        # distinct objects
+        self.assertEqual(len({source.stem for source in sources}), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
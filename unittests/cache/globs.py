@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cpppm import cache as cache_module
+from cpppm.cache.globs import GlobCache, glob
+from cpppm.config import config
+
+
+class GlobCacheTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name) / 'src'
+        (self.root / 'sub').mkdir(parents=True)
+        for path in 'a.cpp', 'b.hpp', 'sub/c.cpp':
+            (self.root / path).write_text('')
+        self.age(1000)
+
+    def age(self, seconds, *directories):
+        """Set directories (default: the whole tree) modification time in the past"""
+        for directory in directories or (self.root, self.root / 'sub'):
+            t = directory.stat().st_mtime - seconds
+            os.utime(directory, (t, t))
+
+    def test_directories(self):
+        self.assertEqual(GlobCache.directories(self.root, '*.cpp'), [self.root])
+        self.assertEqual(GlobCache.directories(self.root, 's*/*.cpp'), [self.root, self.root / 'sub'])
+        self.assertEqual(GlobCache.directories(self.root, '**/*.cpp'), [self.root, self.root / 'sub'])
+
+    def test_snapshot(self):
+        path = Path(self.tempdir.name) / 'globs.json'
+        cache = GlobCache(path)
+        self.assertEqual(cache.glob(self.root, '*.cpp'), [self.root / 'a.cpp'])
+        self.assertEqual(sorted(cache.glob(self.root, '**/*.cpp')), [self.root / 'a.cpp', self.root / 'sub/c.cpp'])
+        cache.save()
+
+        cache = GlobCache(path)
+        self.assertEqual(cache.glob(self.root, '*.cpp'), [self.root / 'a.cpp'])
+        self.assertEqual(len(cache.glob(self.root, '**/*.cpp')), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+
+        # an added file changes its directory modification time
+        (self.root / 'sub' / 'd.cpp').write_text('')
+        self.age(500, self.root / 'sub')
+        self.assertEqual(cache.glob(self.root, '*.cpp'), [self.root / 'a.cpp'])
+        self.assertEqual(len(cache.glob(self.root, '**/*.cpp')), 3)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_racy(self):
+        cache = GlobCache()
+        (self.root / 'e.cpp').write_text('')
+        cache.glob(self.root, '*.cpp')
+        cache.glob(self.root, '*.cpp')
+        # just modified directory: not kept
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_exclude(self):
+        cache = GlobCache()
+        build = self.root / 'sub'
+        self.assertEqual(cache.glob(self.root, '**/*.cpp', exclude=build), [self.root / 'a.cpp'])
+        self.assertEqual(GlobCache.directories(self.root, '**/*.cpp', exclude=build), [self.root])
+        # unless globbing from the excluded directory
+        self.assertEqual(cache.glob(build, '*.cpp', exclude=build), [build / 'c.cpp'])
+
+    def test_exclude_build_option(self):
+        build = self.root / 'sub'
+        with mock.patch.object(cache_module, 'build_root', build):
+            # generated sources can be globbed by default
+            self.assertEqual(sorted(glob(self.root, '**/*.cpp')), [self.root / 'a.cpp', build / 'c.cpp'])
+            with mock.patch.object(config, 'glob_exclude_build', True):
+                self.assertEqual(glob(self.root, '**/*.cpp'), [self.root / 'a.cpp'])
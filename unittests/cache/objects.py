@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.cache.objects import ObjectCache
+from cpppm.utils.sha import file_sha1
+
+
+class ObjectCacheTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+        self.source = self.root / 'main.cpp'
+        self.header = self.root / 'main.hpp'
+        self.output = self.root / 'main.o'
+        self.source.write_text('#include "main.hpp"')
+        self.header.write_text('int i;')
+        self.output.write_text('object')
+        self.cache = ObjectCache(self.root / 'cache', 1 << 20)
+
+    def test_nominal(self):
+        key = self.cache.key(self.source, ['-O3'], 'gcc-10-x86_64')
+        self.assertIsNone(self.cache.fetch(key, self.output))
+        self.cache.store(key, self.output, [self.source, self.header])
+        self.output.unlink()
+        self.assertEqual(set(self.cache.fetch(key, self.output)), {self.source, self.header})
+        self.assertEqual(self.output.read_text(), 'object')
+        self.assertEqual((self.cache.hits, self.cache.misses, self.cache.stored), (1, 1, 1))
+
+    def test_header_changed(self):
+        key = self.cache.key(self.source, ['-O3'], 'gcc-10-x86_64')
+        self.cache.store(key, self.output, [self.source, self.header])
+        self.header.write_text('long i;')
+        self.assertIsNone(self.cache.fetch(key, self.output))
+
+    def test_command_changed(self):
+        key = self.cache.key(self.source, ['-O3'], 'gcc-10-x86_64')
+        self.cache.store(key, self.output, [self.source, self.header])
+        self.assertNotEqual(key, self.cache.key(self.source, ['-O2'], 'gcc-10-x86_64'))
+
+    def test_evict(self):
+        cache = ObjectCache(self.root / 'cache', 4)
+        key = cache.key(self.source, ['-O3'], 'gcc-10-x86_64')
+        cache.store(key, self.output, [self.source])
+        cache.evict()
+        self.assertFalse(list((self.root / 'cache').glob('*/*.o')))
+        # evicted objects manifest entries are removed too
+        self.assertFalse(list((self.root / 'cache').glob('*/*.manifest')))
+
+    def test_evict_manifest_entries(self):
+        cache = ObjectCache(self.root / 'cache', 1 << 20)
+        key = cache.key(self.source, ['-O3'], 'gcc-10-x86_64')
+        cache.store(key, self.output, [self.source, self.header])
+        self.header.write_text('long i;')
+        self.output.write_text('other object')
+        cache.store(key, self.output, [self.source, self.header])
+        self.assertEqual(len(cache._load_manifest(key)), 2)
+        # only the first object fits
+        first, second = sorted((self.root / 'cache').glob('*/*.o'), key=lambda p: p.read_text())
+        os.utime(first, (0, 0))
+        cache.max_size = first.stat().st_size + second.stat().st_size - 1
+        cache.evict()
+        self.assertEqual(list((self.root / 'cache').glob('*/*.o')), [second])
+        self.assertEqual(cache._load_manifest(key), [{str(self.source): file_sha1(self.source),
+                                                      str(self.header): file_sha1(self.header)}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from cpppm import project as project_module
+from cpppm.project import Project
+
+
+class ConanGraphCacheTestCase(unittest.TestCase):
+    graph = {'boost': ['zlib'], 'zlib': []}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def setUp(self):
+        self.build_infos = self.root / 'conanbuildinfo.json'
+        self.build_infos.write_text(json.dumps({'dependencies': [{'name': 'boost'}, {'name': 'zlib'}]}))
+        self.conan_file = self.root / 'conanfile.py'
+        self.conan_file.write_text('requires = ("boost/1.75.0",)\n')
+        # project state only (no script, no conan)
+        self.project = Project.__new__(Project)
+        self.project._root_path = self.root
+        self.project.build_path = self.root / 'build'
+        self.project._requires = {'boost/1.75.0'}
+        self.project._build_requires = set()
+        self.project._options = {'shared': [True, False]}
+        self.project._default_options = {'shared': False}
+        self.project._requires_options = dict()
+        self.project._subprojects = set()
+        self.toolchain = SimpleNamespace(conan_profile_args=['compiler=gcc', 'compiler.version=12'], env_list=[])
+        patches = [mock.patch.object(project_module, 'config', SimpleNamespace(toolchain=self.toolchain)),
+                   mock.patch.object(Project, '_pkg_libraries', dict.fromkeys(self.graph))]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.project._save_conan_graph(self.build_infos, self.graph)
+
+    def load(self):
+        return self.project._load_conan_graph(self.build_infos)
+
+    def test_reused(self):
+        self.assertEqual(self.load(), self.graph)
+
+    def test_conan_file(self):
+        self.conan_file.write_text('requires = ("boost/1.76.0",)\n')
+        self.assertIsNone(self.load())
+
+    def test_build_infos(self):
+        self.build_infos.write_text(json.dumps({'dependencies': [{'name': 'boost'}, {'name': 'bzip2'}]}))
+        self.assertIsNone(self.load())
+
+    def test_requires(self):
+        self.project.requires = 'fmt/7.1.3'
+        self.assertIsNone(self.load())
+
+    def test_requires_options(self):
+        self.project.requires_options = {'boost:shared': True}
+        self.assertIsNone(self.load())
+
+    def test_default_options(self):
+        self.project.default_options = {'shared': True}
+        self.assertIsNone(self.load())
+
+    def test_profile(self):
+        self.toolchain.conan_profile_args = ['compiler=gcc', 'compiler.version=11']
+        self.assertIsNone(self.load())
+
+    def test_packages(self):
+        Project._pkg_libraries['fmt'] = None
+        self.assertIsNone(self.load())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# modules only needed by some commands (conan packages, templates, interactive consoles)
+_LAZY_MODULES = ('conans', 'jinja2', 'IPython', 'click_shell')
+
+
+_PROJECT = """from cpppm import Project, main
+project = Project('startup')
+if __name__ == '__main__':
+    main()
+"""
+
+
+class StartupTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+
+    def test_lazy_imports(self):
+        code = 'import sys, time\n' \
+               'start = time.perf_counter()\n' \
+               'import cpppm\n' \
+               'print(time.perf_counter() - start)\n' \
+               f'print(",".join(m for m in {_LAZY_MODULES!r} if m in sys.modules))\n'
+        out = subprocess.check_output([sys.executable, '-c', code], text=True).splitlines()
+        duration, loaded = float(out[0]), out[1]
+        self.assertEqual(loaded, '', f'imported by cpppm: {loaded}')
+        # generous bound, only catching heavy imports regressions (full conan import alone is ~300ms)
+        self.assertLess(duration, 2.0)
+
+    def test_lazy_command(self):
+        root = Path(self.tempdir.name)
+        (root / 'project.py').write_text(_PROJECT)
+        env = dict(os.environ,
+                   PYTHONPATH=os.pathsep.join([str(Path(__file__).parents[1]), os.environ.get('PYTHONPATH', '')]))
+        code = 'import runpy, sys\n' \
+               'sys.argv = ["project.py", "config", "show"]\n' \
+               'try:\n' \
+               '    runpy.run_path("project.py", run_name="__main__")\n' \
+               'except SystemExit:\n' \
+               '    pass\n' \
+               f'print(",".join(m for m in {_LAZY_MODULES!r} if m in sys.modules))\n'
+        # first run detects the toolchain (may use conan)
+        subprocess.check_output([sys.executable, '-c', code], cwd=root, env=env)
+        loaded = subprocess.check_output([sys.executable, '-c', code], cwd=root, env=env, text=True).splitlines()[-1]
+        self.assertEqual(loaded, '', f'imported by config show: {loaded}')
@@ -0,0 +1,33 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from cpppm import Library
+from cpppm.project import Project
+from cpppm.utils.decorators import collect_version
+
+
+class TargetTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def test_compile_sources_memoized(self):
+        project = SimpleNamespace(bin_path=self.root / 'bin', lib_path=self.root / 'lib')
+        with mock.patch.object(Project, 'current_project', project):
+            lib = Library('lib', self.root, self.root / 'build')
+        lib.sources = 'a.cpp', 'a.hpp'
+        include_dirs = lib.include_dirs
+        version = collect_version()
+        self.assertEqual(list(lib.compile_sources), [Path('a.cpp')])
+        self.assertIs(lib.compile_sources, lib.compile_sources)
+        # deriving compile sources does not invalidate collected values
+        self.assertEqual(collect_version(), version)
+        self.assertIs(lib.include_dirs, include_dirs)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from cpppm.build.stats import BuildStatistics
+from cpppm.testing import TestResultCache, TestRunner, package_fingerprint, parse_shard, write_junit
+
+
+class FakeTest:
+    def __init__(self, name, executable='true'):
+        self.name = name
+        self.executable_path = Path(shutil.which(executable) or executable)
+        self.environment = {}
+        self.link_libraries = []
+
+
+class TestRunnerTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard('2/3'), (2, 3))
+        for invalid in '0/3', '4/3', '3', 'a/b':
+            with self.assertRaises(ValueError):
+                parse_shard(invalid)
+
+    def test_shard(self):
+        tests = [FakeTest(name) for name in 'edcba']
+        shards = [[t.name for t in TestRunner(tests, BuildStatistics(self.root / 's.json'), shard=(i, 2)).tests]
+                  for i in (1, 2)]
+        self.assertEqual(shards, [['a', 'c', 'e'], ['b', 'd']])
+
+    def test_longest_first(self):
+        stats = BuildStatistics(self.root / 'stats.json')
+        tests = [FakeTest(name, name) for name in ('true', 'false', 'sh')]
+        stats.record(tests[0].executable_path, 'true', 1.0)
+        stats.record(tests[1].executable_path, 'false', 2.0)
+        runner = TestRunner(tests, stats)
+        # never run first
+        self.assertEqual([t.name for t in runner.ordered], ['sh', 'false', 'true'])
+
+    def test_run(self):
+        stats = BuildStatistics(self.root / 'stats.json')
+        tests = [FakeTest('ok', 'true'), FakeTest('ko', 'false')]
+        results = asyncio.get_event_loop().run_until_complete(TestRunner(tests, stats).run())
+        statuses = {r.test.name: r.status for r in results}
+        self.assertEqual(statuses, {'ok': 'passed', 'ko': 'failed'})
+        self.assertIsNotNone(BuildStatistics(stats.path).last(tests[0].executable_path, 'wall'))
+
+        report = self.root / 'report.xml'
+        write_junit(results, report)
+        suite = ET.parse(report).getroot().find('testsuite')
+        self.assertEqual(suite.get('tests'), '2')
+        self.assertEqual(suite.get('failures'), '1')
+        self.assertIsNotNone(suite.find("testcase[@name='ko']/failure"))
+
+    def test_cache(self):
+        stats = BuildStatistics(self.root / 'stats.json')
+        tests = [FakeTest('ok', 'true'), FakeTest('ko', 'false')]
+
+        def run():
+            cache = TestResultCache(self.root / 'results.json')
+            results = asyncio.get_event_loop().run_until_complete(TestRunner(tests, stats, cache=cache).run())
+            return {r.test.name: r.status for r in results}
+
+        self.assertEqual(run(), {'ok': 'passed', 'ko': 'failed'})
+        # failed tests are run again
+        self.assertEqual(run(), {'ok': 'cached', 'ko': 'failed'})
+
+        tests[0].environment = {'SEED': '1'}
+        self.assertEqual(run(), {'ok': 'passed', 'ko': 'failed'})
+
+    def test_package_fingerprint(self):
+        folder = self.root / 'package' / '3fb49604f9c2f729b85ba3115852006824e72cab'
+        folder.mkdir(parents=True)
+        (folder / 'conanmanifest.txt').write_text('1600000000\nlib/liba.a: 0123\n')
+        fingerprint = package_fingerprint(folder)
+        self.assertEqual(package_fingerprint(folder), fingerprint)
+        # rebuilt package
+        (folder / 'conanmanifest.txt').write_text('1600000001\nlib/liba.a: 4567\n')
+        self.assertNotEqual(package_fingerprint(folder), fingerprint)
+        # other package id
+        self.assertNotEqual(package_fingerprint(folder.with_name('5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9')),
+                            fingerprint)
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cpppm import cache
+from cpppm.toolchains import toolchain as toolchain_module
+from cpppm.toolchains.toolchain import CompilerId, _UnixCompilersCache, _unix_compiler_candidates, \
+    _unix_compilers_key, find_unix_toolchain
+
+
+@unittest.skipIf(shutil.which('gcc') is None, 'gcc not available')
+class UnixToolchainTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+
+    def setUp(self):
+        self.build_root = cache.build_root
+        cache.build_root = Path(self.tempdir.name)
+
+    def tearDown(self):
+        cache.build_root = self.build_root
+
+    def test_cached(self):
+        key = _unix_compilers_key('gcc', 'g++', 'gdb', None)
+        toolchain = find_unix_toolchain('gcc', 'g++', 'gdb')
+        entry = _UnixCompilersCache().get(key, toolchain.cc)
+        self.assertEqual(entry['cc'], str(toolchain.cc))
+        self.assertIsNotNone(entry['tools'])
+        # same toolchain from cached results
+        self.assertEqual(find_unix_toolchain('gcc', 'g++', 'gdb').cc, toolchain.cc)
+        self.assertEqual(find_unix_toolchain('gcc', 'g++', 'gdb', version=str(toolchain.major)).cc, toolchain.cc)
+
+    def test_candidates(self):
+        bin_1, bin_2 = Path(self.tempdir.name) / 'bin1', Path(self.tempdir.name) / 'bin2'
+        for directory in bin_1, bin_2:
+            directory.mkdir()
+            for name in 'cc', 'cc-10', 'cc-11', 'cc-x', 'ccache':
+                (directory / name).write_text('')
+                (directory / name).chmod(0o755)
+        (bin_1 / 'cc').unlink()
+        (bin_1 / 'cc').symlink_to('cc-11')
+        with mock.patch.dict(os.environ, {'PATH': os.pathsep.join([str(bin_1), str(bin_2)])}):
+            self.assertEqual(_unix_compiler_candidates('cc'),
+                             [bin_1 / 'cc-11', bin_1 / 'cc-10', bin_2 / 'cc', bin_2 / 'cc-10', bin_2 / 'cc-11'])
+
+
+    def test_probe_version_named(self):
+        directory = Path(self.tempdir.name) / 'bin'
+        directory.mkdir()
+        for name in 'cc', 'cxx', 'cc-10', 'cxx-10', 'cc-11', 'cxx-11':
+            (directory / name).write_text('')
+            (directory / name).chmod(0o755)
+        versions = {'cc': 11, 'cc-10': 10, 'cc-11': 11}
+        probed, tools = list(), list()
+
+        def detect_compiler_id(cc_path):
+            probed.append(cc_path.name)
+            return CompilerId('gcc', versions[cc_path.name], 2, 0)
+
+        def find_unix_tools(cc_path, compiler_id, debugger, tools_prefix):
+            tools.append(cc_path.name)
+            return {name: None for name in ('gold', 'nm', 'ar', 'strip', 'dbg')}
+
+        with mock.patch.dict(os.environ, {'PATH': str(directory)}), \
+                mock.patch.object(toolchain_module, 'detect_compiler_id', detect_compiler_id), \
+                mock.patch.object(toolchain_module, '_find_unix_tools', find_unix_tools):
+            self.assertEqual(find_unix_toolchain('cc', 'cxx', 'gdb', version='10').cc, directory / 'cc-10')
+            self.assertEqual((probed, tools), (['cc-10'], ['cc-10']))
+            # not named after the version: unversioned executables are probed
+            self.assertIsNone(find_unix_toolchain('cc', 'cxx', 'gdb', version='12'))
+            self.assertEqual(probed, ['cc-10', 'cc'])
+            # ids are cached per candidate, tools are only looked up for the selected one
+            self.assertEqual(find_unix_toolchain('cc', 'cxx', 'gdb').cc, directory / 'cc-11')
+            self.assertEqual((probed, tools), (['cc-10', 'cc', 'cc-11'], ['cc-10', 'cc-11']))
+
+
+if __name__ == '__main__':
+    unittest.main()
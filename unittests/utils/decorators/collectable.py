@@ -1,6 +1,6 @@
 import copy
 import unittest
-from cpppm.utils.decorators import collectable, CollectError
+from cpppm.utils.decorators import collectable, CollectError, invalidate_collected
 
 
 class CollectableBaseTestCase(unittest.TestCase):
@@ -71,6 +71,31 @@ class CollectableBaseTestCase(unittest.TestCase):
         c1.d = {3: 2}
         self.assertTrue(c0.d == {1: 2, 2: 2, 3: 2})
 
+    def test_memoized(self):
+        c0, c1, c2, _ = self.create_data('s')
+        collected = c0.s
+        self.assertIs(c0.s, collected)
+        # assignment invalidates collected values
+        c2.s = 13
+        self.assertIn(13, c0.s)
+        # direct modifications require explicit invalidation
+        c3 = self.Data()
+        c3.s = 14
+        c2.children.append(c3)
+        invalidate_collected()
+        self.assertIn(14, c0.s)
+
+    def test_own_value_unchanged(self):
+        c0, c1, _, _ = self.create_data('s')
+        self.assertEqual(len(c0.s), 10)
+        self.assertEqual(c0._s, {"01", "02", 3, 4})
+        self.assertEqual(c1._s, {"01", "02", 7, 8})
+
+    def test_lists_memoized(self):
+        c0, _, _, _ = self.create_data('l')
+        self.assertEqual(c0.l, c0.l)
+        self.assertEqual(len(c0.l), 16)
+
 
 class CollectableVariadicTestCase(unittest.TestCase):
     class BaseData:
@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.utils.files import StatCache, write_if_changed
+
+
+class StatCacheTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def test_stat(self):
+        cache = StatCache()
+        path = self.root / 'a.hpp'
+        path.write_text('a')
+        self.assertEqual(cache.stat(path).st_size, 1)
+        self.assertIsNone(cache.stat(self.root / 'missing.hpp'))
+        self.assertIsNone(cache.stat(self.root / 'missing' / 'b.hpp'))
+
+        # cached until invalidated
+        path.write_text('abc')
+        self.assertEqual(cache.stat(path).st_size, 1)
+        cache.invalidate(path)
+        self.assertEqual(cache.stat(path).st_size, 3)
+
+        created = self.root / 'created.hpp'
+        created.write_text('')
+        self.assertIsNone(cache.stat(created))
+        cache.invalidate(created)
+        self.assertIsNotNone(cache.stat(created))
+
+        cache.clear()
+        path.unlink()
+        self.assertIsNone(cache.stat(path))
+
+    def test_write_if_changed(self):
+        path = self.root / 'generated' / 'config.hpp'
+        self.assertTrue(write_if_changed(path, '#define A 1\n'))
+        mtime = path.stat().st_mtime_ns
+        self.assertFalse(write_if_changed(path, '#define A 1\n'))
+        self.assertEqual(path.stat().st_mtime_ns, mtime)
+        self.assertTrue(write_if_changed(path, '#define A 2\n'))
+        self.assertEqual(path.read_text(), '#define A 2\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+
+from cpppm.utils.jobs import JobPool, job_priority, job_memory
+
+
+class JobPoolTestCase(unittest.TestCase):
+
+    def test_bounded(self):
+        pool = JobPool(2)
+        running = []
+
+        async def job():
+            async with pool.job():
+                running.append(pool.running)
+                await asyncio.sleep(0.01)
+
+        async def run_all():
+            await asyncio.gather(*[job() for _ in range(8)])
+
+        asyncio.get_event_loop().run_until_complete(run_all())
+        self.assertTrue(max(running) <= 2)
+        self.assertEqual(pool.total, 8)
+        self.assertEqual(pool.max_running, 2)
+        self.assertEqual(pool.max_pending, 6)
+        self.assertEqual(pool.running, 0)
+        self.assertTrue(0.0 < pool.utilization <= 1.0)
+
+    def test_priority(self):
+        pool = JobPool(1)
+        started = []
+
+        async def job(priority):
+            job_priority.set(priority)
+            async with pool.job():
+                started.append(priority)
+                await asyncio.sleep(0.01)
+
+        async def run_all():
+            await asyncio.gather(*[asyncio.ensure_future(job(p)) for p in (0, 1, 5, 3)])
+
+        asyncio.get_event_loop().run_until_complete(run_all())
+        # first one is started immediately, then queued jobs are given highest priority first
+        self.assertEqual(started, [0, 5, 3, 1])
+        self.assertEqual(pool.running, 0)
+
+    def test_memory_limit(self):
+        pool = JobPool(4, memory_limit=100)
+        memory = []
+
+        async def job(expected):
+            job_memory.set(expected)
+            async with pool.job():
+                memory.append(pool.memory)
+                await asyncio.sleep(0.01)
+
+        async def run_all():
+            # the oversized job is run alone
+            await asyncio.gather(*[asyncio.ensure_future(job(m)) for m in (40, 40, 40, 150, 10)])
+
+        asyncio.get_event_loop().run_until_complete(run_all())
+        self.assertTrue(all(m <= 100 for m in memory if m != 150))
+        self.assertIn(150, memory)
+        self.assertEqual(pool.max_memory, 150)
+        self.assertEqual(pool.memory, 0)
+        self.assertEqual(pool.total, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 
 from pathlib import Path
 
-from cpppm.utils.decorators import list_property
+from cpppm.utils.decorators import collectable, list_property
 from cpppm.utils.pathlist import PathList
 
 
@@ -24,6 +24,27 @@ class PathListTestCase(unittest.TestCase):
         lst.extend(PathList(Path('/usr'), 'lib'))
         self.assertTrue(lst.absolute() == [Path('/tmp/1'), Path('/tmp/2'), Path('/usr/lib')])
 
+    def test_collected(self):
+        parent, child = Node(Path('/tmp')), Node(Path('/usr'))
+        parent.children.append(child)
+        parent.paths = '1'
+        self.assertEqual(parent.paths.absolute(), [Path('/tmp/1')])
+        # direct modifications invalidate collected values
+        child._paths.append('lib')
+        self.assertEqual(parent.paths.absolute(), [Path('/tmp/1'), Path('/usr/lib')])
+        # collected into a copy
+        self.assertEqual(parent._paths.absolute(), [Path('/tmp/1')])
+        self.assertIs(parent.paths, parent.paths)
+
+
+class Node:
+    def __init__(self, root: Path):
+        self._paths = PathList(root)
+        self.children = []
+
+    @collectable(lambda self: self.children)
+    def paths(self) -> PathList:
+        return self._paths
 
 
 class Object:
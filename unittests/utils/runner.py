@@ -0,0 +1,53 @@
+import asyncio
+import os
+import signal
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from cpppm.utils.runner import _exit_code, _run_process
+
+
+class RunProcessTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def test_exit_code(self):
+        self.assertEqual(_exit_code(3 << 8), 3)
+        self.assertEqual(_exit_code(signal.SIGKILL), -signal.SIGKILL)
+
+    def test_returncode(self):
+        run = asyncio.get_event_loop().run_until_complete
+        self.assertEqual(run(_run_process(['sh', '-c', 'exit 3'], None))[0], 3)
+        result = run(_run_process(['sleep', '10'], None, timeout=0.1))
+        self.assertEqual((result[0], result.timed_out), (-signal.SIGKILL, True))
+
+    def test_cancel(self):
+        pid_file = self.root / 'pid'
+
+        async def scenario():
+            task = asyncio.ensure_future(_run_process(['sh', '-c', f'echo $$ > {pid_file}; exec sleep 30'], None))
+            while not pid_file.exists() or not pid_file.read_text().strip():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.get_event_loop().run_until_complete(scenario())
+        pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.01)
+        else:
+            self.fail('process still running after cancellation')
+
+
+if __name__ == '__main__':
+    unittest.main()
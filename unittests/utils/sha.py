@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.utils import sha
+from cpppm.utils.sha import file_sha1, prune_file_digests
+
+
+class FileDigestsTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def test_prune(self):
+        watched, other = self.root / 'watched.cpp', self.root / 'other.cpp'
+        for path in watched, other:
+            path.write_text(path.name)
+            file_sha1(path)
+        st = watched.stat()
+        os.utime(watched, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+        digest = file_sha1(watched)
+
+        prune_file_digests([watched])
+        # only the latest version of watched files is kept
+        self.assertEqual([key[0] for key in sha._file_digests if key[0] in {str(watched), str(other)}],
+                         [str(watched)])
+        self.assertEqual(file_sha1(watched), digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.utils.store import JsonStore
+
+
+class Store(JsonStore):
+    version = 2
+
+    def set(self, key, value):
+        self._entries[key] = value
+        self._dirty = True
+
+
+class JsonStoreTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.path = Path(self.tempdir.name) / 'store.json'
+
+    def test_persistence(self):
+        store = Store(self.path)
+        store.save()
+        # not modified: not written
+        self.assertFalse(self.path.exists())
+        store.set('a', 1)
+        store.save()
+        self.assertEqual(Store(self.path)._entries, {'a': 1})
+        self.assertEqual([p.name for p in self.path.parent.iterdir()], ['store.json'])
+
+    def test_version(self):
+        self.path.write_text(json.dumps({'version': 1, 'entries': {'a': 1}}))
+        self.assertEqual(Store(self.path)._entries, {})
+        self.path.write_text('{')
+        self.assertEqual(Store(self.path)._entries, {})
+
+    def test_memory(self):
+        store = Store(None)
+        store.set('a', 1)
+        store.save()
+        self.assertEqual(store._entries, {'a': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
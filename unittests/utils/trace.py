@@ -0,0 +1,47 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.utils.trace import Tracer
+
+
+class TracerTestCase(unittest.TestCase):
+
+    def test_disabled(self):
+        tracer = Tracer()
+        with tracer.span('main.o', 'compile'):
+            pass
+        self.assertEqual(tracer.events, [])
+
+    def test_lanes(self):
+        tracer = Tracer()
+        tracer.start()
+        with tracer.span('a.o', 'compile', target='a'):
+            with tracer.span('b.o', 'compile') as args:
+                args['pid'] = 42
+        with tracer.span('c.o', 'compile'):
+            pass
+        with self.assertRaises(RuntimeError):
+            with tracer.span('d.o', 'compile'):
+                raise RuntimeError('failed')
+        tracer.stop()
+
+        events = {event['name']: event for event in tracer.events}
+        self.assertEqual(events['a.o']['tid'], 0)
+        self.assertEqual(events['b.o']['tid'], 1)
+        self.assertEqual(events['b.o']['args'], {'pid': '42'})
+        self.assertEqual(events['c.o']['tid'], 0)
+        self.assertIn('error', events['d.o']['args'])
+        self.assertTrue(events['a.o']['dur'] >= events['b.o']['dur'])
+
+        with tempfile.TemporaryDirectory(prefix='cpppm-tests-') as tmp:
+            path = Path(tmp) / 'trace.json'
+            tracer.save(path)
+            data = json.loads(path.read_text())
+        self.assertEqual(len(data['traceEvents']), 5)
+        self.assertEqual(data['traceEvents'][0]['ph'], 'M')
+
+
+if __name__ == '__main__':
+    unittest.main()
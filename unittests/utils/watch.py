@@ -0,0 +1,44 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from cpppm.utils.watch import InotifyWatcher, PollingWatcher, _libc
+
+
+class WatcherTestCase(unittest.TestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tempdir = tempfile.TemporaryDirectory(prefix='cpppm-tests-')
+        self.root = Path(self.tempdir.name)
+
+    def _check(self, make_watcher):
+        watched = self.root / 'a.cpp'
+        other = self.root / 'b.cpp'
+        watched.write_text('a')
+
+        async def scenario():
+            with make_watcher([watched]) as watcher:
+                await asyncio.sleep(0.1)
+                other.write_text('b')
+                watched.write_text('aa')
+                changes = await asyncio.wait_for(watcher.changes(debounce=0.1), 5)
+                self.assertEqual(changes, {watched})
+
+                # only watched files are reported
+                other.write_text('bb')
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(watcher.changes(debounce=0.1), 1)
+
+                watched.unlink()
+                changes = await asyncio.wait_for(watcher.changes(debounce=0.1), 5)
+                self.assertEqual(changes, {watched})
+
+        asyncio.get_event_loop().run_until_complete(scenario())
+
+    def test_polling(self):
+        self._check(lambda files: PollingWatcher(files, interval=0.05))
+
+    @unittest.skipIf(_libc() is None, 'inotify not available')
+    def test_inotify(self):
+        self._check(InotifyWatcher)